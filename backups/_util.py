@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Small helpers shared by the backup and diagnostic scripts
+"""
+
+import asyncio
+import re
+import sys
+
+# Prefer RE2 (linear-time, no backtracking) for scanning large HTML bodies
+try:
+    import re2 as fast_re
+except ImportError:
+    fast_re = re
+
+# libuv-based event loop when uvloop is installed
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+def decode_body(raw, charset):
+    """Decode a response body with its declared charset, falling back to UTF-8"""
+    try:
+        return raw.decode(charset or 'utf-8', errors='ignore')
+    except LookupError:
+        # Unknown charset from the server: fall back to UTF-8, as .text() did
+        return raw.decode('utf-8', errors='ignore')
+
+def block_buffer_stdout():
+    """Block-buffer the report instead of flushing on every line"""
+    sys.stdout.reconfigure(line_buffering=False)
+
+def install_uvloop():
+    """Run the following asyncio.run() calls on uvloop when it is installed"""
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
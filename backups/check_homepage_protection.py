@@ -1,9 +1,25 @@
 #!/usr/bin/env python3
 import asyncio
 import aiohttp
-import re
 import sys
 sys.path.append('.')
+from term_search import find_term_positions
+from _util import block_buffer_stdout, decode_body, fast_re
+
+# Escape control characters in printed context in one C-level pass
+ESCAPE_MAP = str.maketrans({'\n': '\\n', '\r': '\\r', '\t': '\\t'})
+
+# Email protection patterns
+PROTECTION_PATTERNS = {
+    'CloudFlare Email Protection': fast_re.compile(r'(?i)<a href="/cdn-cgi/l/email-protection"[^>]*>([^<]*)</a>'),
+    'CloudFlare data-cfemail': fast_re.compile(r'(?i)data-cfemail="([a-f0-9]+)"'),
+    'Encrypted email spans': fast_re.compile(r'(?i)<span[^>]*class="[^"]*email[^"]*"[^>]*>([^<]*)</span>'),
+    'Base64 encoded emails': fast_re.compile(r'(?i)[a-zA-Z0-9+/]{20,}={0,2}'),
+    'ROT13 encoded': fast_re.compile(r'(?i)vasb@'),  # info@ in ROT13
+    'Hexadecimal encoded': fast_re.compile(r'(?i)&#x[0-9a-fA-F]+;'),
+    'JavaScript email decode': fast_re.compile(r'(?i)function\s+[^(]*email[^(]*\([^)]*\)'),
+    'Email protection services': fast_re.compile(r'(?i)(mailhide|cryptemail|antispam)'),
+}
 
 async def check_homepage_protection():
     """Check what email protection is used on thetechnovate.com homepage"""
@@ -24,30 +40,28 @@ async def check_homepage_protection():
         }
         
         async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
-            content = await response.text(errors='ignore')
+            raw = await response.read()
+            content = decode_body(raw, response.charset)
             
             print(f"Homepage analysis for {url}")
             print(f"Content length: {len(content)}")
             
             # Look for various email protection patterns
-            protection_patterns = {
-                'CloudFlare Email Protection': r'<a href="/cdn-cgi/l/email-protection"[^>]*>([^<]*)</a>',
-                'CloudFlare data-cfemail': r'data-cfemail="([a-f0-9]+)"',
-                'Encrypted email spans': r'<span[^>]*class="[^"]*email[^"]*"[^>]*>([^<]*)</span>',
-                'Base64 encoded emails': r'[a-zA-Z0-9+/]{20,}={0,2}',
-                'ROT13 encoded': r'vasb@',  # info@ in ROT13
-                'Hexadecimal encoded': r'&#x[0-9a-fA-F]+;',
-                'JavaScript email decode': r'function\s+[^(]*email[^(]*\([^)]*\)',
-                'Email protection services': r'(mailhide|cryptemail|antispam)',
-            }
-            
             print(f"\nLooking for email protection patterns:")
             
-            for pattern_name, pattern in protection_patterns.items():
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                if matches:
-                    print(f"+ {pattern_name}: Found {len(matches)} matches")
-                    if len(matches) <= 5:  # Show first 5 matches
+            for pattern_name, pattern in PROTECTION_PATTERNS.items():
+                # Count every match but only keep the first few for display
+                count = 0
+                matches = []
+                group = 1 if pattern.groups else 0
+                for m in pattern.finditer(content):
+                    count += 1
+                    if count <= 5:
+                        matches.append(m.group(group))
+                
+                if count:
+                    print(f"+ {pattern_name}: Found {count} matches")
+                    if count <= 5:  # Show first 5 matches
                         for match in matches:
                             print(f"    {match}")
                 else:
@@ -65,29 +79,22 @@ async def check_homepage_protection():
                 '__cf_email__',
             ]
             
+            content_lower = content.lower()
+            terms_lower = [term.lower() for term in email_search_terms]
+            term_positions = find_term_positions(content_lower, terms_lower)
+            
             print(f"\nSearching for email-related content:")
-            for term in email_search_terms:
-                if term.lower() in content.lower():
-                    count = content.lower().count(term.lower())
+            for term, term_lower in zip(email_search_terms, terms_lower):
+                count, positions = term_positions[term_lower]
+                if count:
                     print(f"+ '{term}': Found {count} times")
                     
                     # Show context for CloudFlare protection specifically
                     if 'cfemail' in term or 'email-protection' in term:
-                        positions = []
-                        start = 0
-                        while True:
-                            pos = content.lower().find(term.lower(), start)
-                            if pos == -1:
-                                break
-                            positions.append(pos)
-                            start = pos + 1
-                            if len(positions) >= 3:
-                                break
-                        
                         for i, pos in enumerate(positions):
                             context_start = max(0, pos - 100)
                             context_end = min(len(content), pos + 200)
-                            context = content[context_start:context_end].replace('\n', '\\n')
+                            context = content[context_start:context_end].translate(ESCAPE_MAP)
                             print(f"    Context {i+1}: ...{context}...")
                 else:
                     print(f"- '{term}': Not found")
@@ -95,9 +102,10 @@ async def check_homepage_protection():
             # Save snippet for manual inspection
             if 'cfemail' in content or 'email-protection' in content:
                 print(f"\nSaving homepage snippet for CloudFlare email protection analysis...")
-                with open('homepage_snippet.html', 'w', encoding='utf-8', errors='ignore') as f:
-                    f.write(content)
+                with open('homepage_snippet.html', 'wb') as f:
+                    f.write(raw)
                 print("Saved to homepage_snippet.html")
 
 if __name__ == "__main__":
+    block_buffer_stdout()
     asyncio.run(check_homepage_protection())
\ No newline at end of file
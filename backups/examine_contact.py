@@ -1,10 +1,43 @@
 #!/usr/bin/env python3
 import asyncio
 import aiohttp
-import re
 import sys
+from itertools import islice
 sys.path.append('.')
 from main import WebsiteAnalyzer
+from term_search import find_term_positions
+from _util import block_buffer_stdout, decode_body, fast_re
+
+# Escape control characters in printed context in one C-level pass
+ESCAPE_MAP = str.maketrans({'\n': '\\n', '\r': '\\r', '\t': '\\t'})
+
+def first_matches(pattern, content, limit):
+    """Same as pattern.findall(content)[:limit] without building the full match list"""
+    group = 1 if pattern.groups else 0
+    return [m.group(group) for m in islice(pattern.finditer(content), limit)]
+
+# JavaScript patterns that might contain emails
+JS_PATTERNS = [
+    fast_re.compile(r'(?i)var\s+[^=]*email[^=]*=\s*["\']([^"\']*)["\']'),
+    fast_re.compile(r'(?i)email\s*:\s*["\']([^"\']*)["\']'),
+    fast_re.compile(r'(?i)contact[^=]*=\s*["\']([^"\']*@[^"\']*)["\']'),
+    fast_re.compile(r'(?i)"([^"]*@[^"]*)"'),
+    fast_re.compile(r"(?i)'([^']*@[^']*)'"),
+]
+
+# Data attributes
+DATA_PATTERNS = [
+    fast_re.compile(r'(?i)data-email=["\']([^"\']*)["\']'),
+    fast_re.compile(r'(?i)data-contact=["\']([^"\']*)["\']'),
+    fast_re.compile(r'(?i)href=["\']mailto:([^"\']*)["\']'),
+]
+
+# Contact section samples
+CONTACT_SECTION_PATTERNS = [
+    fast_re.compile(r'(?is)contact[^>]*>([^<]{0,500})'),
+    fast_re.compile(r'(?is)email[^>]*>([^<]{0,200})'),
+    fast_re.compile(r'(?is)get in touch[^>]*>([^<]{0,300})'),
+]
 
 async def examine_contact_page():
     """Examine the contact page content in detail"""
@@ -26,7 +59,8 @@ async def examine_contact_page():
         }
         
         async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
-            content = await response.text(errors='ignore')
+            raw = await response.read()
+            content = decode_body(raw, response.charset)
             
             print(f"Contact page analysis for {url}")
             print(f"Content length: {len(content)}")
@@ -48,74 +82,47 @@ async def examine_contact_page():
                 'mailto:',
             ]
             
+            content_lower = content.lower()
+            terms_lower = [pattern.lower() for pattern in email_searches]
+            pattern_positions = find_term_positions(content_lower, terms_lower)
+            
             print(f"\nSearching for email patterns:")
-            for pattern in email_searches:
-                if pattern.lower() in content.lower():
-                    count = content.lower().count(pattern.lower())
+            for pattern, term_lower in zip(email_searches, terms_lower):
+                count, positions = pattern_positions[term_lower]
+                if count:
                     print(f"  '{pattern}': Found {count} times")
                     
                     # Show context for first few matches
                     if count > 0 and count <= 3:
-                        positions = []
-                        start = 0
-                        while True:
-                            pos = content.lower().find(pattern.lower(), start)
-                            if pos == -1:
-                                break
-                            positions.append(pos)
-                            start = pos + 1
-                            if len(positions) >= 3:
-                                break
-                        
                         for i, pos in enumerate(positions):
                             context_start = max(0, pos - 50)
                             context_end = min(len(content), pos + 50)
-                            context = content[context_start:context_end].replace('\n', '\\n')
+                            context = content[context_start:context_end].translate(ESCAPE_MAP)
                             print(f"    Context {i+1}: ...{context}...")
                 else:
                     print(f"  '{pattern}': Not found")
             
             # Look for JavaScript that might contain emails
             print(f"\nLooking for JavaScript patterns:")
-            js_patterns = [
-                r'var\s+[^=]*email[^=]*=\s*["\']([^"\']*)["\']',
-                r'email\s*:\s*["\']([^"\']*)["\']',
-                r'contact[^=]*=\s*["\']([^"\']*@[^"\']*)["\']',
-                r'"([^"]*@[^"]*)"',
-                r"'([^']*@[^']*)'",
-            ]
-            
-            for pattern in js_patterns:
-                matches = re.findall(pattern, content, re.IGNORECASE)
+            for pattern in JS_PATTERNS:
+                matches = first_matches(pattern, content, 5)  # Show first 5 matches
                 if matches:
-                    print(f"  Pattern '{pattern}': {matches[:5]}")  # Show first 5 matches
+                    print(f"  Pattern '{pattern.pattern}': {matches}")
             
             # Look for data attributes
             print(f"\nLooking for data attributes:")
-            data_patterns = [
-                r'data-email=["\']([^"\']*)["\']',
-                r'data-contact=["\']([^"\']*)["\']',
-                r'href=["\']mailto:([^"\']*)["\']',
-            ]
-            
-            for pattern in data_patterns:
-                matches = re.findall(pattern, content, re.IGNORECASE)
+            for pattern in DATA_PATTERNS:
+                matches = pattern.findall(content)  # Every match is printed
                 if matches:
-                    print(f"  Pattern '{pattern}': {matches}")
+                    print(f"  Pattern '{pattern.pattern}': {matches}")
             
             # Show a larger sample of the contact section
             print(f"\nLooking for contact sections:")
-            contact_section_patterns = [
-                r'contact[^>]*>([^<]{0,500})',
-                r'email[^>]*>([^<]{0,200})',
-                r'get in touch[^>]*>([^<]{0,300})',
-            ]
-            
-            for pattern in contact_section_patterns:
-                matches = re.findall(pattern, content, re.IGNORECASE | re.DOTALL)
+            for pattern in CONTACT_SECTION_PATTERNS:
+                matches = first_matches(pattern, content, 2)  # Show first 2
                 if matches:
                     print(f"  Contact section found:")
-                    for match in matches[:2]:  # Show first 2
+                    for match in matches:
                         clean_match = match.replace('\n', ' ').strip()[:200]
                         print(f"    {clean_match}...")
             
@@ -127,21 +134,24 @@ async def examine_contact_page():
             # Save a snippet of the content to file for manual inspection
             print(f"\nSaving content snippet to contact_snippet.html...")
             # Find sections that might contain contact info
-            snippet_keywords = ['contact', 'email', 'touch', 'reach', 'info']
-            snippet_content = ""
+            # Slice the original response bytes so nothing is re-encoded
+            snippet_keywords = [b'contact', b'email', b'touch', b'reach', b'info']
+            raw_lower = raw.lower()
+            snippet_parts = []
             
             for keyword in snippet_keywords:
-                keyword_pos = content.lower().find(keyword)
+                keyword_pos = raw_lower.find(keyword)
                 if keyword_pos != -1:
                     start = max(0, keyword_pos - 500)
-                    end = min(len(content), keyword_pos + 1500)
-                    snippet_content += f"\n\n=== Section containing '{keyword}' ===\n"
-                    snippet_content += content[start:end]
+                    end = min(len(raw), keyword_pos + 1500)
+                    snippet_parts.append(b"\n\n=== Section containing '" + keyword + b"' ===\n")
+                    snippet_parts.append(raw[start:end])
             
-            with open('contact_snippet.html', 'w', encoding='utf-8', errors='ignore') as f:
-                f.write(snippet_content)
+            with open('contact_snippet.html', 'wb') as f:
+                f.write(b"".join(snippet_parts))
             
             print("Done! Check contact_snippet.html for manual inspection.")
 
 if __name__ == "__main__":
+    block_buffer_stdout()
     asyncio.run(examine_contact_page())
\ No newline at end of file
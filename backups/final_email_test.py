@@ -2,6 +2,7 @@
 
 # Test the real issue with thetechnovate.com
 import re
+from _util import block_buffer_stdout
 
 def test_real_website_scenario():
     """
@@ -56,6 +57,8 @@ def test_real_website_scenario():
     print("Testing email extraction on various scenarios:")
     print()
     
+    # One extract_emails call per scenario: it returns only the top five emails
+    # without positions, so results of a joined buffer can't be split back per case
     for i, test_case in enumerate(test_cases, 1):
         print(f"Test Case {i}:")
         print(f"Content: {test_case[:100]}...")
@@ -81,4 +84,5 @@ def test_real_website_scenario():
     print("For sites like thetechnovate.com, additional methods are needed.")
 
 if __name__ == "__main__":
+    block_buffer_stdout()
     test_real_website_scenario()
\ No newline at end of file
@@ -1,10 +1,25 @@
 #!/usr/bin/env python3
 import asyncio
 import aiohttp
-import re
 import sys
 sys.path.append('.')
 from main import WebsiteAnalyzer
+from _util import decode_body, fast_re
+
+# Contact page links in the HTML
+CONTACT_LINK_PATTERNS = [
+    fast_re.compile(r'(?i)href=["\']([^"\']*contact[^"\']*)["\'"]'),
+    fast_re.compile(r'(?i)href=["\']([^"\']*get-in-touch[^"\']*)["\'"]'),
+    fast_re.compile(r'(?i)href=["\']([^"\']*reach[^"\']*)["\'"]'),
+]
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+TIMEOUT = aiohttp.ClientTimeout(total=30)
 
 async def find_contact_page():
     """Find the correct contact page URL for thetechnovate.com"""
@@ -29,98 +44,87 @@ async def find_contact_page():
         use_dns_cache=True,
     )
     
-    async with aiohttp.ClientSession(connector=connector) as session:
+    # Bound the number of simultaneous requests to the same site
+    semaphore = asyncio.Semaphore(5)
+    
+    async with aiohttp.ClientSession(connector=connector, headers=HEADERS, timeout=TIMEOUT) as session:
+        
+        async def try_url(url: str):
+            """Fetch a candidate URL and return (url, emails) if it has emails"""
+            async with semaphore:
+                print(f"Trying: {url}")
+                try:
+                    async with session.get(url) as response:
+                        if response.status != 200:
+                            print(f"  {url} - Status: {response.status}")
+                            return None
+                        
+                        raw = await response.read()
+                        content = decode_body(raw, response.charset)
+                except Exception as e:
+                    print(f"  {url} - Error: {e}")
+                    return None
+            
+            print(f"  {url} - Status: 200 - Content length: {len(content)}")
+            
+            # Test email extraction on this page
+            emails = analyzer.extract_emails(content)
+            print(f"  {url} - Emails found: {emails}")
+            
+            if not emails:
+                return None
+            
+            # Show some content around the email
+            email_pos = content.lower().find('info@thetechnovate.com')
+            if email_pos != -1:
+                start = max(0, email_pos - 100)
+                end = min(len(content), email_pos + 100)
+                print(f"  Context: ...{content[start:end]}...")
+            
+            return url, emails
+        
         # First, get the main page HTML and look for contact page links
         print("Fetching main page to find contact page links...")
         main_result = await analyzer.fetch_website(session, "thetechnovate.com", 30)
         
+        candidate_urls = []
         if 'content' in main_result:
             html = main_result['content']
             
             # Look for contact page links in the HTML
-            contact_patterns = [
-                r'href=["\']([^"\']*contact[^"\']*)["\'"]',
-                r'href=["\']([^"\']*get-in-touch[^"\']*)["\'"]',
-                r'href=["\']([^"\']*reach[^"\']*)["\'"]',
-            ]
-            
             found_links = []
-            for pattern in contact_patterns:
-                matches = re.findall(pattern, html, re.IGNORECASE)
+            for pattern in CONTACT_LINK_PATTERNS:
+                matches = pattern.findall(html)
                 found_links.extend(matches)
             
             print(f"Found potential contact links: {found_links[:10]}")
             
-            # Try each found link
             for link in found_links[:5]:  # Try first 5
                 if link.startswith('/'):
-                    full_url = f"https://thetechnovate.com{link}"
+                    candidate_urls.append(f"https://thetechnovate.com{link}")
                 elif link.startswith('http'):
-                    full_url = link
+                    candidate_urls.append(link)
                 else:
-                    full_url = f"https://thetechnovate.com/{link}"
-                
-                print(f"\nTrying: {full_url}")
-                
-                try:
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                        'Accept-Language': 'en-US,en;q=0.5',
-                    }
-                    
-                    async with session.get(full_url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                        if response.status == 200:
-                            content = await response.text(errors='ignore')
-                            print(f"  Status: {response.status} - Content length: {len(content)}")
-                            
-                            # Test email extraction on this page
-                            emails = analyzer.extract_emails(content)
-                            print(f"  Emails found: {emails}")
-                            
-                            if emails:
-                                print(f"  SUCCESS! Found emails on {full_url}")
-                                
-                                # Show some content around the email
-                                if 'info@thetechnovate.com' in content.lower():
-                                    email_pos = content.lower().find('info@thetechnovate.com')
-                                    start = max(0, email_pos - 100)
-                                    end = min(len(content), email_pos + 100)
-                                    print(f"  Context: ...{content[start:end]}...")
-                                
-                                return full_url, emails
-                        else:
-                            print(f"  Status: {response.status}")
-                            
-                except Exception as e:
-                    print(f"  Error: {e}")
+                    candidate_urls.append(f"https://thetechnovate.com/{link}")
         
-        # If no links found in main page, try common patterns
-        print(f"\nTrying common contact page URLs...")
+        # Also try common patterns, avoiding duplicates
         for url in contact_urls:
-            print(f"Trying: {url}")
-            try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                }
-                
-                async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    if response.status == 200:
-                        content = await response.text(errors='ignore')
-                        print(f"  Status: {response.status} - Content length: {len(content)}")
-                        
-                        emails = analyzer.extract_emails(content)
-                        print(f"  Emails found: {emails}")
-                        
-                        if emails:
-                            print(f"  SUCCESS! Found emails on {url}")
-                            return url, emails
-                    else:
-                        print(f"  Status: {response.status}")
-                        
-            except Exception as e:
-                print(f"  Error: {e}")
+            if url not in candidate_urls:
+                candidate_urls.append(url)
+        
+        # Try all candidates concurrently and stop at the first page with emails
+        print(f"\nTrying {len(candidate_urls)} contact page URLs...")
+        tasks = [asyncio.create_task(try_url(url)) for url in candidate_urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result:
+                    print(f"  SUCCESS! Found emails on {result[0]}")
+                    return result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
     
     print("No contact page with emails found")
     return None, []
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Search-term scanning shared by the page diagnostic scripts
+"""
+
+# Multi-needle search: one Aho-Corasick pass when pyahocorasick is installed
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+def find_term_positions(content_lower, terms, limit=3):
+    """Return {term: (count, first positions)} for lowercase terms in the lowercased content"""
+    # Counts are non-overlapping like str.count; positions also take overlapping
+    # hits, like a find loop that advances one character at a time
+    counts = dict.fromkeys(terms, 0)
+    positions = {term: [] for term in terms}
+    
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for term in terms:
+            automaton.add_word(term, term)
+        automaton.make_automaton()
+        next_free = dict.fromkeys(terms, 0)
+        for end, term in automaton.iter(content_lower):
+            pos = end - len(term) + 1
+            if pos >= next_free[term]:
+                counts[term] += 1
+                next_free[term] = end + 1
+            if len(positions[term]) < limit:
+                positions[term].append(pos)
+    else:
+        # bytes.find/count run memchr/memmem over one contiguous buffer
+        content_bytes = content_lower.encode('utf-8', 'ignore')
+        is_ascii = len(content_bytes) == len(content_lower)
+        for term in terms:
+            term_bytes = term.encode('utf-8')
+            counts[term] = content_bytes.count(term_bytes)
+            pos = content_bytes.find(term_bytes)
+            while pos != -1 and len(positions[term]) < limit:
+                # Byte offsets only differ from str offsets for non-ASCII pages
+                positions[term].append(pos if is_ascii else len(content_bytes[:pos].decode('utf-8', 'ignore')))
+                pos = content_bytes.find(term_bytes, pos + 1)
+    
+    return {term: (counts[term], positions[term]) for term in terms}
@@ -1,53 +1,58 @@
 #!/usr/bin/env python3
 import sys
 sys.path.append('.')
-from main import WebsiteAnalyzer
+
+# Show non-printable decoded bytes as '?'
+PRINTABLE_OR_QMARK = bytes(b if 32 <= b <= 126 else ord('?') for b in range(256))
 
 def test_cloudflare_decoder():
     """Test CloudFlare email decoder with actual data from thetechnovate.com"""
-    
-    analyzer = WebsiteAnalyzer()
+    # Import the API module (FastAPI, aiohttp, pydantic) only when the test actually runs
+    from main import analyzer, CF_XOR_TABLES
     
     # The actual encrypted email from thetechnovate.com homepage
     test_html = '''
     <span class="__cf_email__" data-cfemail="254c4b434a65514d405140464d4b4a534451400b464a48">[email&#160;protected]</span>
     '''
     
-    print("Testing CloudFlare Email Decoder")
-    print("=" * 40)
-    print(f"Input HTML: {test_html.strip()}")
-    print()
+    out = [
+        "Testing CloudFlare Email Decoder",
+        "=" * 40,
+        f"Input HTML: {test_html.strip()}",
+        "",
+    ]
     
     # Test the decoder directly
     emails = analyzer.decode_cloudflare_emails(test_html)
-    print(f"Decoded emails: {emails}")
+    out.append(f"Decoded emails: {emails}")
     
     # Test the full email extraction pipeline
     all_emails = analyzer.extract_emails(test_html)
-    print(f"Full extraction result: {all_emails}")
+    out.append(f"Full extraction result: {all_emails}")
     
     # Manual verification of the CloudFlare algorithm
-    print("\nManual CloudFlare decoding verification:")
+    out.append("\nManual CloudFlare decoding verification:")
     encrypted = "254c4b434a65514d405140464d4b4a534451400b464a48"
-    print(f"Encrypted string: {encrypted}")
+    out.append(f"Encrypted string: {encrypted}")
     
     if len(encrypted) >= 2:
-        key = int(encrypted[:2], 16)  # First 2 chars as hex
-        encrypted_email = encrypted[2:]
-        print(f"Key: {key} (0x{key:02x})")
-        print(f"Encrypted part: {encrypted_email}")
+        # Parse every hex pair in one call; the first byte is the key
+        data = bytes.fromhex(encrypted[:len(encrypted) - len(encrypted) % 2])
+        key = data[0]
+        encrypted_bytes = data[1:]
+        out.append(f"Key: {key} (0x{key:02x})")
+        out.append(f"Encrypted part: {encrypted[2:]}")
         
-        decoded_chars = []
-        for i in range(0, len(encrypted_email), 2):
-            if i + 1 < len(encrypted_email):
-                hex_pair = encrypted_email[i:i+2]
-                char_code = int(hex_pair, 16) ^ key
-                char = chr(char_code) if 32 <= char_code <= 126 else '?'
-                decoded_chars.append(char)
-                print(f"  {hex_pair} -> {char_code} ^ {key} = {char_code ^ key} = '{char}'")
+        # XOR the whole buffer at once through the key's translation table
+        decoded_bytes = encrypted_bytes.translate(CF_XOR_TABLES[key])
+        decoded_email = decoded_bytes.translate(PRINTABLE_OR_QMARK).decode('ascii')
         
-        decoded_email = ''.join(decoded_chars)
-        print(f"Final decoded email: '{decoded_email}'")
+        out.extend(
+            f"  {byte:02x} -> {char_code} ^ {key} = {char_code ^ key} = '{char}'"
+            for byte, char_code, char in zip(encrypted_bytes, decoded_bytes, decoded_email)
+        )
+        
+        out.append(f"Final decoded email: '{decoded_email}'")
     
     # Test with other common email protection methods
     other_test_cases = [
@@ -64,14 +69,17 @@ def test_cloudflare_decoder():
         '''
     ]
     
-    print("\nTesting other protection methods:")
-    print("=" * 40)
+    out.append("\nTesting other protection methods:")
+    out.append("=" * 40)
     
     for i, test_case in enumerate(other_test_cases, 1):
-        print(f"\nTest case {i}:")
-        print(f"Input: {test_case[:100]}...")
+        out.append(f"\nTest case {i}:")
+        out.append(f"Input: {test_case[:100]}...")
         emails = analyzer.extract_emails(test_case)
-        print(f"Extracted: {emails}")
+        out.append(f"Extracted: {emails}")
+    
+    # Emit the whole report with a single write
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     test_cloudflare_decoder()
\ No newline at end of file
@@ -1,57 +1,64 @@
 #!/usr/bin/env python3
 import asyncio
+import aiohttp
 import sys
 sys.path.append('.')
-from main import WebsiteAnalyzer
+from main import analyzer
+from _util import install_uvloop
 
 async def test_contact_fallback():
     """Test contact page fallback for jackiemariejewelry.com"""
     
-    analyzer = WebsiteAnalyzer()
-    
     print("=== CONTACT PAGE FALLBACK TEST ===")
     print("Testing jackiemariejewelry.com - homepage vs contact page emails")
     print()
     
-    # Test the complete analysis with fallback
-    print("1. Running complete analysis with contact page fallback...")
-    result = await analyzer.analyze_website("jackiemariejewelry.com", timeout=30)
-    
-    print(f"Domain: {result.domain}")
-    print(f"Status: {result.status}")
-    print(f"Platform: {result.platform}")
-    print(f"HTTPS: {result.isHttps}")
-    print()
-    
-    print("=== EMAIL RESULTS ===")
-    print(f"Emails found: {result.emails}")
-    print(f"Email count: {result.emailCount}")
-    
-    if result.emails:
-        print("SUCCESS! Found emails:")
-        for i, email in enumerate(result.emails, 1):
-            print(f"  {i}. {email}")
-    else:
-        print("No emails found (check if site is accessible)")
-    
-    print()
-    print("=== OTHER CONTACT INFO ===")
-    print(f"Phones: {result.phones}")
-    print(f"Phone count: {result.phoneCount}")
+    # One pooled session for the full analysis and the manual homepage/contact fetches
+    connector = aiohttp.TCPConnector(
+        ssl=False,
+        limit=100,
+        limit_per_host=10,
+        ttl_dns_cache=300,
+        keepalive_timeout=60,
+    )
     
-    print(f"Contact pages: {result.contactPageCount} found")
-    if result.contactPages:
-        for page in result.contactPages:
-            print(f"  - {page['linkText']}: {page['url']}")
-    
-    print()
-    print("=== MANUAL TESTING ===")
-    print("Let's manually test homepage vs contact page...")
-    
-    # Test homepage only
-    import aiohttp
-    connector = aiohttp.TCPConnector(ssl=False)
     async with aiohttp.ClientSession(connector=connector) as session:
+        # Test the complete analysis with fallback
+        print("1. Running complete analysis with contact page fallback...")
+        result = await analyzer.analyze_website("jackiemariejewelry.com", timeout=30, session=session)
+        
+        print(f"Domain: {result.domain}")
+        print(f"Status: {result.status}")
+        print(f"Platform: {result.platform}")
+        print(f"HTTPS: {result.isHttps}")
+        print()
+        
+        print("=== EMAIL RESULTS ===")
+        print(f"Emails found: {result.emails}")
+        print(f"Email count: {result.emailCount}")
+        
+        if result.emails:
+            print("SUCCESS! Found emails:")
+            for i, email in enumerate(result.emails, 1):
+                print(f"  {i}. {email}")
+        else:
+            print("No emails found (check if site is accessible)")
+        
+        print()
+        print("=== OTHER CONTACT INFO ===")
+        print(f"Phones: {result.phones}")
+        print(f"Phone count: {result.phoneCount}")
+        
+        print(f"Contact pages: {result.contactPageCount} found")
+        if result.contactPages:
+            for page in result.contactPages:
+                print(f"  - {page['linkText']}: {page['url']}")
+        
+        print()
+        print("=== MANUAL TESTING ===")
+        print("Let's manually test homepage vs contact page...")
+        
+        # Test homepage only
         print("\n2. Testing homepage only...")
         homepage_result = await analyzer.fetch_website(session, "jackiemariejewelry.com", 30)
         
@@ -84,8 +91,6 @@ async def test_contact_fallback():
 async def test_multiple_domains():
     """Test contact fallback with multiple domains"""
     
-    analyzer = WebsiteAnalyzer()
-    
     test_domains = [
         "jackiemariejewelry.com",
         "thetechnovate.com",  # Known to have emails on homepage
@@ -95,11 +100,25 @@ async def test_multiple_domains():
     print(f"\n{'='*60}")
     print("=== TESTING MULTIPLE DOMAINS ===")
     
-    for domain in test_domains:
+    # Analyze every domain concurrently, bounded like test_basic_parallel.py
+    semaphore = asyncio.Semaphore(10)
+    connector = aiohttp.TCPConnector(ssl=False, limit_per_host=4, ttl_dns_cache=300)
+    
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def analyze(domain: str):
+            async with semaphore:
+                return await analyzer.analyze_website(domain, timeout=20, session=session)
+        
+        results = await asyncio.gather(*(analyze(domain) for domain in test_domains), return_exceptions=True)
+    
+    for domain, result in zip(test_domains, results):
         print(f"\nTesting: {domain}")
         print("-" * 40)
         
-        result = await analyzer.analyze_website(domain, timeout=20)
+        if isinstance(result, Exception):
+            print(f"Error: {result}")
+            continue
+        
         print(f"Status: {result.status}")
         print(f"Emails: {result.emails}")
         print(f"Count: {result.emailCount}")
@@ -108,6 +127,7 @@ async def test_multiple_domains():
             print(f"Error: {result.error}")
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(test_contact_fallback())
     print("\n" + "="*60)
     asyncio.run(test_multiple_domains())
\ No newline at end of file
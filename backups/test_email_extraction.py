@@ -1,142 +1,207 @@
+import heapq
 import re
-from typing import List
+import sys
+from operator import itemgetter
+from typing import List, Optional
+
+# Multi-needle search: one Aho-Corasick pass when pyahocorasick is installed
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Patterns compiled once at import rather than looked up in re's cache per call
+# Local part is one possessive run that must end in an alphanumeric, so a failed
+# '@' never backtracks through it; the captured local part locates the '@'
+EMAIL_RE = re.compile(r'\b([a-zA-Z0-9][a-zA-Z0-9._%-]*+(?<=[a-zA-Z0-9]))@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}\b', re.IGNORECASE)
+HASH_RE = re.compile(r'^[a-f0-9]{20,}@')
+DIGITS_TAIL_RE = re.compile(r'\d{3,}$')
+PERSONAL_NAME_RE = re.compile(r'^[a-z]+\.[a-z]+$')
+
+# Unique addresses collected from one page before the scan stops
+MAX_CANDIDATES = 50
+
+# Free-mail providers that don't earn the company-domain bonus
+GENERIC_PROVIDERS = frozenset(['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com'])
+
+# Filter out emails that are obviously not contact emails
+SUSPICIOUS_PATTERNS = (
+    re.compile(r'\.(png|jpg|jpeg|gif|svg|webp|ico|css|js|json|xml)@'),
+    re.compile(r'^[0-9]+@'),  # emails starting with only numbers
+    re.compile(r'[0-9]{8,}@'),  # long number sequences
+)
+# The same checks as one alternation, so a clean email costs a single search
+SUSPICIOUS_RE = re.compile('|'.join(pattern.pattern for pattern in SUSPICIOUS_PATTERNS))
+
+# Reduced blacklist for testing
+EMAIL_BLACKLIST_PATTERNS = (
+    'example.com', 'test.com', 'placeholder', 'noreply', 'no-reply',
+    'sentry.io', 'tracking', 'analytics', 'localhost', '.ru'
+)
+# One alternation scans each email once instead of once per pattern
+EMAIL_BLACKLIST_RE = re.compile('|'.join(map(re.escape, EMAIL_BLACKLIST_PATTERNS)))
+# Aho-Corasick automaton over the same patterns
+EMAIL_BLACKLIST_AUTOMATON = None
+if ahocorasick is not None:
+    EMAIL_BLACKLIST_AUTOMATON = ahocorasick.Automaton()
+    for pattern in EMAIL_BLACKLIST_PATTERNS:
+        EMAIL_BLACKLIST_AUTOMATON.add_word(pattern, pattern)
+    EMAIL_BLACKLIST_AUTOMATON.make_automaton()
+
+# Generic role usernames that lose points in scoring
+GENERIC_USERNAMES = frozenset([
+    'info', 'admin', 'support', 'contact', 'help', 'sales', 'service',
+    'team', 'hello', 'mail', 'email', 'webmaster'
+])
 
 class EmailExtractorDebug:
-    def __init__(self):
-        # Reduced blacklist for testing
-        self.email_blacklist_patterns = [
-            'example.com', 'test.com', 'placeholder', 'noreply', 'no-reply',
-            'sentry.io', 'tracking', 'analytics', 'localhost', '.ru'
-        ]
+    def __init__(self, debug: bool = True):
+        # Diagnostic trace is built and written only when debug is on
+        self.debug = debug
         
-        self.generic_usernames = [
-            'info', 'admin', 'support', 'contact', 'help', 'sales', 'service',
-            'team', 'hello', 'mail', 'email', 'webmaster'
-        ]
+        # Filter structures are built once at import and shared by every extractor
+        self.email_blacklist_patterns = EMAIL_BLACKLIST_PATTERNS
+        self.email_blacklist_re = EMAIL_BLACKLIST_RE
+        self.email_blacklist_automaton = EMAIL_BLACKLIST_AUTOMATON
+        self.generic_usernames = GENERIC_USERNAMES
+
+    def is_blacklisted(self, email_lower: str) -> bool:
+        """Single pass over the email for any blacklist pattern"""
+        if self.email_blacklist_automaton is not None:
+            return next(self.email_blacklist_automaton.iter(email_lower), None) is not None
+        return self.email_blacklist_re.search(email_lower) is not None
 
     def extract_emails_debug(self, html: str) -> List[str]:
         """Debug version of email extraction"""
-        print("=== EMAIL EXTRACTION DEBUG ===")
-        
-        # More comprehensive email regex
-        email_regex = r'\b[a-zA-Z0-9](?:[a-zA-Z0-9._%-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}\b'
-        email_matches = re.findall(email_regex, html, re.IGNORECASE)
+        debug = self.debug
+        out = []
+        if debug:
+            out.append("=== EMAIL EXTRACTION DEBUG ===")
         
-        print(f"Raw email matches found: {len(email_matches)}")
-        for i, email in enumerate(email_matches[:10]):  # Show first 10
-            print(f"  {i+1}. {email}")
-        
-        if len(email_matches) > 10:
-            print(f"  ... and {len(email_matches) - 10} more")
-        
-        # Remove duplicates (case insensitive)
-        unique_emails = []
-        seen_emails = set()
-        for email in email_matches:
-            email_lower = email.lower()
-            if email_lower not in seen_emails:
-                seen_emails.add(email_lower)
-                unique_emails.append(email)
+        # More comprehensive email regex, streamed so no list of every hit is built;
+        # a page without '@' cannot match it
+        raw_count = 0
+        truncated = False
+        first_matches = []  # first 10 raw matches, for the trace
+        # Remove duplicates (case insensitive) as matches arrive, keeping the first
+        # spelling in page order; only the top 3 are kept after scoring, so stop
+        # once MAX_CANDIDATES unique addresses are in hand
+        # Each entry also keeps the '@' offset, so the parts are slices, not a split
+        first_spelling = {}
+        if '@' in html:
+            for match in EMAIL_RE.finditer(html):
+                email = match.group(0)
+                raw_count += 1
+                if raw_count <= 10:
+                    first_matches.append(email)
+                first_spelling.setdefault(email.lower(), (email, len(match.group(1))))
+                if len(first_spelling) >= MAX_CANDIDATES:
+                    truncated = True
+                    break
+        unique_emails = first_spelling.items()
         
-        print(f"\nUnique emails: {len(unique_emails)}")
+        if debug:
+            # An early stop leaves the rest of the page unscanned, so the count is a floor
+            more = "+" if truncated else ""
+            out.append(f"Raw email matches found: {raw_count}{more}")
+            if truncated:
+                out.append(f"  (scan stopped after {MAX_CANDIDATES} unique candidates; the rest of the page was not counted)")
+            for i, email in enumerate(first_matches):  # Show first 10
+                out.append(f"  {i+1}. {email}")
+            
+            if raw_count > 10:
+                out.append(f"  ... and {raw_count - 10}{more} more")
+            
+            out.append(f"\nUnique emails: {len(unique_emails)}")
         
         # Apply filters
         valid_emails = []
-        for email in unique_emails:
-            email_lower = email.lower().strip()
-            
-            # Skip if @ not in email (shouldn't happen with regex, but safety check)
-            if '@' not in email_lower:
-                print(f"FILTERED (no @): {email}")
-                continue
-                
-            username, domain = email_lower.split('@', 1)
+        for email_lower, (email, at) in unique_emails:
+            # The regex captured the local part, so '@' is known to sit at `at`
+            username, domain = email_lower[:at], email_lower[at + 1:]
             
             # Length validation
             if len(email_lower) < 5 or len(email_lower) > 100:  # Increased max length
-                print(f"FILTERED (length {len(email_lower)}): {email}")
+                if debug:
+                    out.append(f"FILTERED (length {len(email_lower)}): {email}")
                 continue
             
             # Check against blacklisted patterns (more lenient)
-            is_blacklisted = False
-            for pattern in self.email_blacklist_patterns:
-                if pattern in email_lower:
-                    print(f"FILTERED (blacklist '{pattern}'): {email}")
-                    is_blacklisted = True
-                    break
-            
-            if is_blacklisted:
+            if self.is_blacklisted(email_lower):
+                if debug:
+                    # Report the first listed pattern that hit, only on the rare filtered path
+                    pattern = next(p for p in self.email_blacklist_patterns if p in email_lower)
+                    out.append(f"FILTERED (blacklist '{pattern}'): {email}")
                 continue
             
             # Check for hash-like emails (more lenient)
-            if re.match(r'^[a-f0-9]{20,}@', email_lower):
-                print(f"FILTERED (hash-like): {email}")
+            if HASH_RE.match(email_lower):
+                if debug:
+                    out.append(f"FILTERED (hash-like): {email}")
                 continue
             
             # Filter out emails that are obviously not contact emails
-            suspicious_patterns = [
-                r'\.(png|jpg|jpeg|gif|svg|webp|ico|css|js|json|xml)@',
-                r'^[0-9]+@',  # emails starting with only numbers
-                r'[0-9]{8,}@'  # long number sequences
-            ]
-            
-            is_suspicious = False
-            for pattern in suspicious_patterns:
-                if re.search(pattern, email_lower):
-                    print(f"FILTERED (suspicious pattern '{pattern}'): {email}")
-                    is_suspicious = True
-                    break
-                    
-            if is_suspicious:
+            if SUSPICIOUS_RE.search(email_lower):
+                if debug:
+                    # Report the first listed pattern that hit, only on the filtered path
+                    pattern = next(p for p in SUSPICIOUS_PATTERNS if p.search(email_lower))
+                    out.append(f"FILTERED (suspicious pattern '{pattern.pattern}'): {email}")
                 continue
                 
-            print(f"VALID: {email}")
-            valid_emails.append(email)
+            if debug:
+                out.append(f"VALID: {email}")
+            valid_emails.append((email, username, domain))
         
-        print(f"\nFinal valid emails: {len(valid_emails)}")
+        if debug:
+            out.append(f"\nFinal valid emails: {len(valid_emails)}")
         
         # Score and sort emails by quality
         scored_emails = []
-        for email in valid_emails:
-            score = self.score_email_debug(email)
+        for email, username, domain in valid_emails:
+            score = self.score_email_debug(email, username, domain)
             scored_emails.append((email, score))
-            print(f"SCORED: {email} -> {score}")
+            if debug:
+                out.append(f"SCORED: {email} -> {score}")
         
-        scored_emails.sort(key=lambda x: x[1], reverse=True)
-        final_emails = [email for email, score in scored_emails[:3]]  # Return top 3
+        # Top 3 by score; nlargest keeps the stable order of a full reverse sort
+        final_emails = [email for email, score in heapq.nlargest(3, scored_emails, key=itemgetter(1))]
         
-        print(f"\nTop emails returned: {final_emails}")
+        if debug:
+            out.append(f"\nTop emails returned: {final_emails}")
+            # Emit the whole trace with a single write
+            sys.stdout.write("\n".join(out) + "\n")
         return final_emails
 
-    def score_email_debug(self, email: str) -> int:
+    def score_email_debug(self, email: str, username: Optional[str] = None, domain: Optional[str] = None) -> int:
         """Debug version of email scoring"""
         score = 100
-        email_lower = email.lower()
-        username, domain = email_lower.split('@', 1)
+        # Callers that already hold the lowercased parts skip the split
+        if username is None or domain is None:
+            username, domain = email.lower().split('@', 1)
         
         # Penalize generic usernames (less strict)
         if username in self.generic_usernames:
             score -= 20  # Reduced penalty
             
         # Penalize numbers at end (less strict)
-        if re.search(r'\d{3,}$', username):  # Only penalize 3+ digits
+        if DIGITS_TAIL_RE.search(username):  # Only penalize 3+ digits
             score -= 10
             
         # Bonus for personal-looking emails
-        if re.match(r'^[a-z]+\.[a-z]+$', username) and len(username) > 3:
+        if PERSONAL_NAME_RE.match(username) and len(username) > 3:
             score += 30
             
         # Bonus for non-generic providers
-        generic_providers = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com']
-        if domain not in generic_providers:
+        if domain not in GENERIC_PROVIDERS:
             score += 25  # Increased bonus for company domains
             
         return score
 
+# Initialize extractor, shared by every test in this module
+extractor = EmailExtractorDebug()
+
 # Test with sample HTML content
 def test_email_extraction():
-    extractor = EmailExtractorDebug()
-    
     sample_html = """
     <html>
     <head><title>Contact Us</title></head>
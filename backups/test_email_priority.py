@@ -4,13 +4,39 @@ Test script for email priority feature
 Tests how different email priority settings affect the results
 """
 
+import asyncio
+import aiohttp
 import requests
 import json
-import time
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 API_BASE_URL = "http://localhost:8000"
 
-def test_email_priority():
+@lru_cache(maxsize=64)
+def compile_priority(priority: Tuple[str, ...]) -> Tuple[Dict[str, int], Tuple[Tuple[str, int], ...], Tuple[str, ...]]:
+    """Split a priority list into exact-domain bonuses and ranked username prefixes"""
+    domain_bonus = {}
+    user_patterns = []
+    for j, pattern in enumerate(priority):
+        if pattern.startswith('@'):
+            domain_bonus.setdefault(pattern[1:], 100 - (j * 10))
+        elif pattern.endswith('@'):
+            user_patterns.append((pattern[:-1], 100 - (j * 10)))
+    return domain_bonus, tuple(user_patterns), tuple(prefix for prefix, _ in user_patterns)
+
+def priority_bonus(username: str, domain: str, priority: Tuple[str, ...]) -> Optional[int]:
+    """Bonus of the earliest priority pattern matching the email, or None"""
+    domain_bonus, user_patterns, user_prefixes = compile_priority(priority)
+    bonus = domain_bonus.get(domain)
+    # One C-level startswith(tuple) screens every username prefix at once
+    if username.startswith(user_prefixes):
+        user_bonus = next(b for prefix, b in user_patterns if username.startswith(prefix))
+        if bonus is None or user_bonus > bonus:
+            bonus = user_bonus
+    return bonus
+
+async def test_email_priority():
     """Test email priority functionality"""
     print("🎯 Testing Email Priority Feature")
     print("=" * 50)
@@ -52,10 +78,8 @@ def test_email_priority():
     
     results = {}
     
-    for config in priority_configs:
-        print(f"Testing: {config['name']}")
-        print(f"  Configuration: {config['description']}")
-        
+    async def post_config(session: aiohttp.ClientSession, config: dict) -> Tuple[int, Any]:
+        """Run the analysis for one priority configuration; returns (status, JSON body or None)"""
         # Prepare request payload
         payload = {
             "domains": [test_domain],
@@ -63,17 +87,28 @@ def test_email_priority():
             "timeout": 15,
             "email_priority": config["email_priority"]
         }
+        async with session.post(f"{API_BASE_URL}/analyze", json=payload,
+                                timeout=aiohttp.ClientTimeout(total=30)) as response:
+            return response.status, await response.json() if response.status == 200 else None
+    
+    # The configurations are independent, so send them all at once on one
+    # event loop and report the responses in order
+    async with aiohttp.ClientSession() as session:
+        outcomes = await asyncio.gather(
+            *(post_config(session, config) for config in priority_configs),
+            return_exceptions=True
+        )
+    
+    for config, outcome in zip(priority_configs, outcomes):
+        print(f"Testing: {config['name']}")
+        print(f"  Configuration: {config['description']}")
         
         try:
-            # Make API request
-            response = requests.post(
-                f"{API_BASE_URL}/analyze",
-                json=payload,
-                timeout=30
-            )
+            if isinstance(outcome, BaseException):
+                raise outcome
+            status, data = outcome
             
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
                 if data and len(data) > 0:
                     result = data[0]
                     emails = result.get('emails', [])
@@ -91,15 +126,14 @@ def test_email_priority():
                     print(f"  ❌ No results returned")
                     results[config['name']] = {'emails': [], 'count': 0}
             else:
-                print(f"  ❌ API request failed: {response.status_code}")
-                results[config['name']] = {'error': response.status_code}
+                print(f"  ❌ API request failed: {status}")
+                results[config['name']] = {'error': status}
                 
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"  ❌ Request failed: {e}")
             results[config['name']] = {'error': str(e)}
         
         print()  # Empty line between tests
-        time.sleep(1)  # Small delay between requests
     
     # Summary
     print("=" * 50)
@@ -147,26 +181,22 @@ def test_priority_scoring():
     
     print(f"\nTesting {len(priority_tests)} priority configurations:")
     
+    # Split each mock email once, not once per configuration
+    mock_parts = [(email, *email.split('@')) for email in mock_emails]
+    
     for i, priority in enumerate(priority_tests, 1):
         print(f"\n{i}. Priority: {priority}")
+        priority = tuple(priority)
         
         # Simple scoring simulation (would use actual API scoring in real test)
         scores = []
-        for email in mock_emails:
+        for email, username, domain in mock_parts:
             score = 100  # Base score
-            username, domain = email.split('@')
             
-            # Apply priority bonus
-            for j, pattern in enumerate(priority):
-                if pattern.startswith('@'):
-                    if domain == pattern[1:] or domain.endswith(pattern):
-                        score += 100 - (j * 10)
-                        break
-                elif pattern.endswith('@'):
-                    pattern_prefix = pattern[:-1]
-                    if username == pattern_prefix or username.startswith(pattern_prefix):
-                        score += 100 - (j * 10)
-                        break
+            # Apply priority bonus; the earliest matching pattern has the largest bonus
+            bonus = priority_bonus(username, domain, priority)
+            if bonus is not None:
+                score += bonus
             
             scores.append((email, score))
         
@@ -193,7 +223,7 @@ def main():
     
     # Run tests
     test_priority_scoring()
-    # test_email_priority()  # Uncomment to test with real API calls
+    # asyncio.run(test_email_priority())  # Uncomment to test with real API calls
     
     print("\n✅ Email priority testing completed!")
     print("\nTo test with real domains, uncomment the test_email_priority() call")
@@ -3,11 +3,19 @@
 import re
 from typing import List
 
+# Blacklist substrings, matched with one alternation per email
+BLACKLIST = ['noreply', 'no-reply', 'example.com', 'test.com', 'tracking', 'analytics']
+BLACKLIST_RE = re.compile('|'.join(map(re.escape, BLACKLIST)))
+
+# Compiled once at import rather than looked up in re's cache per call
+# Local part is one possessive run that must end in an alphanumeric, so a failed
+# '@' never backtracks through it
+EMAIL_RE = re.compile(r'\b[a-zA-Z0-9][a-zA-Z0-9._%-]*+(?<=[a-zA-Z0-9])@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}\b', re.IGNORECASE)
+
 def extract_emails_simple(html: str) -> List[str]:
     """Simple email extraction for testing"""
-    # More comprehensive email regex
-    email_regex = r'\b[a-zA-Z0-9](?:[a-zA-Z0-9._%-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}\b'
-    email_matches = re.findall(email_regex, html, re.IGNORECASE)
+    # More comprehensive email regex; a page without '@' cannot match it
+    email_matches = EMAIL_RE.findall(html) if '@' in html else []
     
     print(f"Found {len(email_matches)} potential emails:")
     for email in email_matches:
@@ -15,9 +23,12 @@ def extract_emails_simple(html: str) -> List[str]:
     
     # Simple filtering
     valid_emails = []
-    blacklist = ['noreply', 'no-reply', 'example.com', 'test.com', 'tracking', 'analytics']
     
-    for email in set(email_matches):  # Remove duplicates
+    # Remove duplicates (case insensitive), keeping page order and the first spelling
+    first_spelling = dict(zip(map(str.lower, reversed(email_matches)), reversed(email_matches)))
+    unique_emails = [first_spelling[key] for key in dict.fromkeys(map(str.lower, email_matches))]
+    
+    for email in unique_emails:
         email_lower = email.lower()
         
         # Check length
@@ -25,7 +36,7 @@ def extract_emails_simple(html: str) -> List[str]:
             continue
             
         # Check blacklist
-        if any(pattern in email_lower for pattern in blacklist):
+        if BLACKLIST_RE.search(email_lower):
             print(f"  FILTERED: {email} (blacklist)")
             continue
             
@@ -2,36 +2,45 @@
 import re
 from typing import List
 
+# Obfuscation rewrites and the email regex, compiled once at import
+# Entities are matched case-sensitively, the [at]/(dot) forms case-insensitively
+DEOBFUSCATE_RE = re.compile(r'&#64;|&#46;|&at;|&dot;|(?i:\[at\]|\[dot\]|\(at\)|\(dot\))')
+DEOBFUSCATE_MAP = {
+    '&#64;': '@', '&#46;': '.', '&at;': '@', '&dot;': '.',
+    '[at]': '@', '[dot]': '.', '(at)': '@', '(dot)': '.',
+}
+SPACED_AT_RE = re.compile(r'(\w+)\s{1,2}@\s{1,2}(\w+(?:\.\w+)*)')
+SPACED_DOT_RE = re.compile(r'(\w+@\w+)\s{1,2}\.\s{1,2}(\w+)')
+TAG_SPLIT_RE = re.compile(r'([a-zA-Z0-9._%-]+)</[^>]+>@<[^>]+>([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})')
+# Local part is one possessive run that must end in an alphanumeric, so a failed
+# '@' never backtracks through it
+EMAIL_RE = re.compile(r'\b[a-zA-Z0-9][a-zA-Z0-9._%-]*+(?<=[a-zA-Z0-9])@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}\b', re.IGNORECASE)
+
 def extract_emails_enhanced(html: str) -> List[str]:
     """Enhanced email extraction with obfuscation handling"""
-    # First, handle common obfuscation methods
-    processed_html = html
-    
-    # Decode HTML entities
-    processed_html = processed_html.replace('&#64;', '@').replace('&#46;', '.')
-    processed_html = processed_html.replace('&at;', '@').replace('&dot;', '.')
+    # First, handle common obfuscation methods: HTML entities plus [at]/[dot]
+    # and (at)/(dot), all decoded in a single pass
+    processed_html = DEOBFUSCATE_RE.sub(lambda m: DEOBFUSCATE_MAP[m.group(0).lower()], html)
     
-    # Handle [at] and [dot] obfuscation
-    processed_html = re.sub(r'\[at\]', '@', processed_html, flags=re.IGNORECASE)
-    processed_html = re.sub(r'\[dot\]', '.', processed_html, flags=re.IGNORECASE)
-    processed_html = re.sub(r'\(at\)', '@', processed_html, flags=re.IGNORECASE)
-    processed_html = re.sub(r'\(dot\)', '.', processed_html, flags=re.IGNORECASE)
+    # Every remaining rewrite and the email regex need a literal '@'
+    has_at = '@' in processed_html
     
-    # Handle spaced emails (up to 2 spaces around @ and .)
-    processed_html = re.sub(r'(\w+)\s{1,2}@\s{1,2}(\w+(?:\.\w+)*)', r'\1@\2', processed_html)
-    processed_html = re.sub(r'(\w+@\w+)\s{1,2}\.\s{1,2}(\w+)', r'\1.\2', processed_html)
-    
-    # Remove HTML tags that might split emails
-    tag_split_pattern = r'([a-zA-Z0-9._%-]+)</[^>]+>@<[^>]+>([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-    processed_html = re.sub(tag_split_pattern, r'\1@\2', processed_html)
+    if has_at:
+        # Handle spaced emails (up to 2 spaces around @ and .)
+        processed_html = SPACED_AT_RE.sub(r'\1@\2', processed_html)
+        processed_html = SPACED_DOT_RE.sub(r'\1.\2', processed_html)
+        
+        # Remove HTML tags that might split emails; the pattern can only
+        # match around a literal '>@<', which most pages don't contain
+        if '>@<' in processed_html:
+            processed_html = TAG_SPLIT_RE.sub(r'\1@\2', processed_html)
     
     print("=== Enhanced Email Extraction Test ===")
     print(f"Original HTML length: {len(html)}")
     print(f"Processed HTML length: {len(processed_html)}")
     
     # More comprehensive email regex
-    email_regex = r'\b[a-zA-Z0-9](?:[a-zA-Z0-9._%-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}\b'
-    email_matches = re.findall(email_regex, processed_html, re.IGNORECASE)
+    email_matches = EMAIL_RE.findall(processed_html) if has_at else []
     
     print(f"Email matches found: {len(email_matches)}")
     for email in email_matches:
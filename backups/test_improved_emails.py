@@ -1,13 +1,10 @@
 import asyncio
 import aiohttp
-from main import WebsiteAnalyzer
+from main import analyzer
+from _util import install_uvloop
 
-async def test_email_extraction_real():
-    """Test email extraction with a real website"""
-    analyzer = WebsiteAnalyzer()
-    
-    # Test with a simple HTML sample that mimics real website content
-    test_html = """
+# Test with a simple HTML sample that mimics real website content
+TEST_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -59,23 +56,34 @@ async def test_email_extraction_real():
     </body>
     </html>
     """
-    
+
+BASE_URL = "https://businesscompany.com"
+
+def run_one(html):
+    """Run every extractor over one page with the module's shared analyzer"""
+    return (
+        analyzer.extract_emails(html),
+        analyzer.extract_phones(html),
+        analyzer.extract_contact_pages(html, BASE_URL),
+        analyzer.extract_social_links(html),
+    )
+
+async def test_email_extraction_real():
+    """Test email extraction with a real website"""
     print("Testing email extraction with improved algorithm...")
-    emails = analyzer.extract_emails(test_html)
+    emails, phones, contact_pages, social_links = run_one(TEST_HTML)
     print(f"Extracted emails: {emails}")
     print(f"Number of emails found: {len(emails)}")
     
     # Test phone extraction too
-    phones = analyzer.extract_phones(test_html)
     print(f"Extracted phones: {phones}")
     
     # Test contact page extraction
-    contact_pages = analyzer.extract_contact_pages(test_html, "https://businesscompany.com")
     print(f"Contact pages: {contact_pages}")
     
     # Test social media extraction
-    social_links = analyzer.extract_social_links(test_html)
     print(f"Social links: {social_links}")
 
 if __name__ == "__main__":
-    asyncio.run(test_email_extraction_real())
\ No newline at end of file
+    install_uvloop()
+    asyncio.run(test_email_extraction_real())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test that rotating the shared session never closes it under a running analysis
+Serves a slow page locally and rotates the session while the request is in flight
+"""
+
+import asyncio
+import sys
+sys.path.append('.')
+from aiohttp import web
+from main import analyzer, shared_session
+
+HOST = '127.0.0.1'
+PORT = 8790
+SLOW_PAGE_DELAY = 1.0  # seconds the page takes to arrive
+
+SLOW_PAGE = '<html><head><title>Slow Page</title></head><body><p>Email: sales@acme-corp.com</p></body></html>'
+
+async def slow_page(request: web.Request) -> web.Response:
+    await asyncio.sleep(SLOW_PAGE_DELAY)
+    return web.Response(text=SLOW_PAGE, content_type='text/html')
+
+async def test_session_rotation() -> bool:
+    """Rotate the shared session mid-request and check the analysis still completes"""
+    print("=== Shared Session Rotation Test ===")
+    
+    app = web.Application()
+    app.router.add_get('/', slow_page)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, HOST, PORT).start()
+    
+    try:
+        analysis = asyncio.create_task(
+            analyzer.analyze_website(f"{HOST}:{PORT}", timeout=10, use_cache=False)
+        )
+        
+        # Let the analysis borrow the session, then force a rotation whose close
+        # grace runs out long before the page arrives
+        await asyncio.sleep(SLOW_PAGE_DELAY / 2)
+        old_session = shared_session.session
+        max_age, close_grace = shared_session.max_age, shared_session.close_grace
+        shared_session.max_age, shared_session.close_grace = 0, SLOW_PAGE_DELAY / 10
+        new_session = shared_session.get_session()
+        shared_session.max_age = max_age
+        
+        # Past the grace, but still inside the request
+        await asyncio.sleep(SLOW_PAGE_DELAY / 5)
+        
+        rotated = new_session is not old_session
+        kept_open = not old_session.closed and old_session in shared_session.retired
+        print(f"{'+' if rotated else '-'} Session rotated mid-request")
+        print(f"{'+' if kept_open else '-'} Retired session kept open for its borrower")
+        
+        result = await analysis
+        shared_session.close_grace = close_grace
+        completed = result.error is None and result.emails == ['sales@acme-corp.com']
+        print(f"{'+' if completed else '-'} Analysis completed: status={result.status}, emails={result.emails}, error={result.error}")
+        
+        closed_after = old_session.closed and old_session not in shared_session.retired
+        print(f"{'+' if closed_after else '-'} Retired session closed once its last borrower finished")
+        
+        passed = rotated and kept_open and completed and closed_after
+        print(f"\n{'PASSED' if passed else 'FAILED'}")
+        return passed
+    finally:
+        await shared_session.close()
+        await runner.cleanup()
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(test_session_rotation()) else 1)
@@ -1,18 +1,31 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, HttpUrl
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Tuple, Union
 import asyncio
 import aiohttp
 import time
 from datetime import datetime
+import html as html_module
 import logging
 import re
 from urllib.parse import urljoin, urlparse
 import json
-from collections import deque
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from functools import wraps
+import itertools
+import multiprocessing
+import os
 import uuid
 
+# Multi-needle search: one Aho-Corasick pass when pyahocorasick is installed
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -39,6 +52,7 @@ class AnalysisRequest(BaseModel):
     timeout: Optional[int] = 15
     include_content: Optional[bool] = False
     email_priority: Optional[List[str]] = ["info@", "sales@", "@gmail.com"]  # Email priority order
+    use_cache: Optional[bool] = True  # False forces a fresh analysis of every domain
 
 class AnalysisJobRequest(BaseModel):
     domains: List[str]
@@ -47,6 +61,7 @@ class AnalysisJobRequest(BaseModel):
     priority: Optional[int] = 1  # 1=low, 2=normal, 3=high
     callback_url: Optional[str] = None
     email_priority: Optional[List[str]] = ["info@", "sales@", "@gmail.com"]  # Email priority order
+    use_cache: Optional[bool] = True  # False forces a fresh analysis of every domain
 
 class JobStatus(BaseModel):
     job_id: str
@@ -115,82 +130,152 @@ class ParallelRateLimiter:
         self.semaphore = asyncio.Semaphore(max_concurrent)
         self.delay = delay
         self.burst_limit = burst_limit
-        self.request_times = []
+        self.request_times = deque()
+        self.next_allowed = 0.0
         self.lock = asyncio.Lock()
 
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
     async def acquire(self):
         await self.semaphore.acquire()
-        
+        try:
+            await self._wait_for_slot()
+        except BaseException:
+            # Cancelled while waiting: give the concurrency slot back
+            self.semaphore.release()
+            raise
+
+    async def _wait_for_slot(self):
+        # The lock only hands out start slots; the wait happens after it's
+        # released, so callers sleep concurrently instead of queueing behind
+        # whoever is sleeping
         async with self.lock:
-            current_time = time.time()
+            # Loop time is monotonic, so the window can't be skewed by clock changes
+            current_time = asyncio.get_running_loop().time()
             
-            # Remove old request times (older than 1 second)
-            self.request_times = [t for t in self.request_times if current_time - t < 1.0]
+            # Remove old request times (older than 1 second); slots are handed
+            # out in order, so the expired ones are always at the left
+            while self.request_times and current_time - self.request_times[0] >= 1.0:
+                self.request_times.popleft()
             
-            # Check burst limit
-            if len(self.request_times) >= self.burst_limit:
-                sleep_time = 1.0 - (current_time - self.request_times[0])
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
+            # Apply minimum delay between requests
+            slot = max(current_time, self.next_allowed)
             
-            # Add current request time
-            self.request_times.append(current_time)
+            # Check burst limit: at most burst_limit slots in any one second
+            if len(self.request_times) >= self.burst_limit:
+                slot = max(slot, self.request_times[-self.burst_limit] + 1.0)
             
-            # Apply minimum delay between requests
-            if len(self.request_times) > 1:
-                time_since_last = current_time - self.request_times[-2]
-                if time_since_last < self.delay:
-                    await asyncio.sleep(self.delay - time_since_last)
+            # Stamp the slot before releasing the lock so the next caller is
+            # spaced from it
+            self.request_times.append(slot)
+            self.next_allowed = slot + self.delay
+        
+        wait = slot - asyncio.get_running_loop().time()
+        if wait > 0:
+            await asyncio.sleep(wait)
 
     def release(self):
         self.semaphore.release()
 
-# Global session pool for better connection reuse
-class SessionPool:
-    def __init__(self, pool_size: int = 5):
-        self.pool_size = pool_size
-        self.sessions = []
-        self.current_index = 0
-        self.lock = asyncio.Lock()
-        
-    async def get_session(self):
-        async with self.lock:
-            if not self.sessions:
-                # Initialize sessions
-                for _ in range(self.pool_size):
-                    connector = aiohttp.TCPConnector(
-                        limit=100,
-                        limit_per_host=20,
-                        ttl_dns_cache=300,
-                        use_dns_cache=True,
-                        ssl=False,
-                        enable_cleanup_closed=True,
-                        keepalive_timeout=30
-                    )
-                    session = aiohttp.ClientSession(
-                        connector=connector,
-                        timeout=aiohttp.ClientTimeout(total=30, connect=10)
-                    )
-                    self.sessions.append(session)
-            
-            # Round-robin session selection
-            session = self.sessions[self.current_index]
-            self.current_index = (self.current_index + 1) % len(self.sessions)
-            return session
+# One shared client session; its connector already pools connections per host.
+# It is rebuilt every max_age seconds: keep-alive sockets left idle behind load
+# balancers can go dead without being dropped from the pool, and each reuse of
+# one then fails or falls back to a fresh handshake
+class SharedSession:
+    def __init__(self, limit: int = 500, limit_per_host: int = 20, max_age: float = 300, close_grace: float = 600):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.max_age = max_age
+        self.close_grace = close_grace
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.created_at = 0.0
+        self.users: Dict[aiohttp.ClientSession, int] = {}  # session -> borrowers inside use()
+        self.retired: Dict[aiohttp.ClientSession, asyncio.Task] = {}
+        
+    def get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        
+        # Retire an expired session. It's closed when its last borrower leaves
+        # use(); the timer only backs that up and waits out any borrower
+        if self.session is not None and not self.session.closed and loop.time() - self.created_at > self.max_age:
+            delay = self.close_grace if self.users.get(self.session) else 0
+            self.retired[self.session] = loop.create_task(self._close_later(self.session, delay))
+            self.session = None
+        
+        # Created on first use, so scripts that never run the app's startup still
+        # get one; nothing awaits between the check and the assignment, so no lock
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300,
+                use_dns_cache=True,
+                ssl=False,
+                enable_cleanup_closed=True,
+                keepalive_timeout=30
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30, connect=10)
+            )
+            self.created_at = loop.time()
+        return self.session
+    
+    @asynccontextmanager
+    async def use(self):
+        """Borrow the current session for a whole unit of work, even if it's retired meanwhile"""
+        session = self.get_session()
+        self.users[session] = self.users.get(session, 0) + 1
+        try:
+            yield session
+        finally:
+            self.users[session] -= 1
+            if not self.users[session]:
+                del self.users[session]
+                task = self.retired.pop(session, None)
+                if task is not None:
+                    task.cancel()
+                    await session.close()
     
-    async def close_all(self):
-        for session in self.sessions:
+    async def _close_later(self, session: aiohttp.ClientSession, delay: float):
+        # Backup close for a retired session; never closes it under a borrower
+        await asyncio.sleep(delay)
+        while self.users.get(session):
+            await asyncio.sleep(self.close_grace)
+        del self.retired[session]
+        await session.close()
+    
+    async def close(self):
+        for session, task in list(self.retired.items()):
+            task.cancel()
             await session.close()
-        self.sessions = []
+        self.retired.clear()
+        self.users.clear()
+        
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
 
 # High-throughput worker queue system
 class WorkerQueue:
-    def __init__(self, max_workers: int = 10, max_queue_size: int = 1000):
+    def __init__(self, max_workers: int = 10, max_queue_size: int = 1000, max_concurrent_domains: int = 50,
+                 max_tracked_jobs: int = 10000):
         self.max_workers = max_workers
         self.max_queue_size = max_queue_size
-        self.job_queue = asyncio.Queue(maxsize=max_queue_size)
-        self.priority_queue = deque()
-        self.jobs = {}  # job_id -> JobStatus
+        self.max_tracked_jobs = max_tracked_jobs
+        self.max_concurrent_domains = max_concurrent_domains
+        # Caps domains in flight across all jobs; each job's batch_size only bounds its own share
+        self.domain_semaphore = asyncio.Semaphore(max_concurrent_domains)
+        # Entries are (-priority, seq, job_data); seq keeps FIFO order within a priority
+        self.job_queue = asyncio.PriorityQueue(maxsize=max_queue_size)
+        self.job_seq = itertools.count()
+        self.jobs = OrderedDict()  # job_id -> JobStatus, least recently used first
+        self.job_events = {}  # job_id -> asyncio.Event, set once the job completes or fails
         self.workers = []
         self.running = False
         self.stats = {
@@ -222,9 +307,10 @@ class WorkerQueue:
         logger.info("All workers stopped")
     
     async def submit_job(self, domains: List[str], batch_size: int = 20, 
-                        timeout: int = 15, priority: int = 1, email_priority: List[str] = None) -> str:
+                        timeout: int = 15, priority: int = 1, email_priority: List[str] = None,
+                        use_cache: bool = True) -> str:
         """Submit a new analysis job"""
-        job_id = str(uuid.uuid4())
+        job_id = uuid.uuid4().hex
         
         job_status = JobStatus(
             job_id=job_id,
@@ -236,27 +322,57 @@ class WorkerQueue:
         )
         
         self.jobs[job_id] = job_status
+        self.job_events[job_id] = asyncio.Event()
+        self._evict_finished_jobs()
         
-        # Add to appropriate queue based on priority
+        # Queue by priority
         job_data = {
             'job_id': job_id,
             'domains': domains,
             'batch_size': batch_size,
             'timeout': timeout,
             'priority': priority,
-            'email_priority': email_priority
+            'email_priority': email_priority,
+            'use_cache': use_cache
         }
         
-        if priority >= 3:  # High priority
-            self.priority_queue.appendleft(job_data)
-        else:
-            await self.job_queue.put(job_data)
+        await self.job_queue.put((-priority, next(self.job_seq), job_data))
         
         logger.info(f"Job {job_id} submitted with {len(domains)} domains (priority: {priority})")
         return job_id
     
     def get_job_status(self, job_id: str) -> Optional[JobStatus]:
         """Get job status by ID"""
+        job_status = self.jobs.get(job_id)
+        if job_status is not None:
+            self.jobs.move_to_end(job_id)
+        return job_status
+    
+    def _evict_finished_jobs(self):
+        """Drop least recently used finished jobs beyond max_tracked_jobs; queued and running jobs are kept"""
+        excess = len(self.jobs) - self.max_tracked_jobs
+        if excess <= 0:
+            return
+        
+        evicted = []
+        for job_id, job in self.jobs.items():
+            if job.status in ('completed', 'failed'):
+                evicted.append(job_id)
+                if len(evicted) == excess:
+                    break
+        
+        for job_id in evicted:
+            del self.jobs[job_id]
+            self.job_events.pop(job_id, None)
+    
+    async def wait_for_job(self, job_id: str, timeout: float) -> Optional[JobStatus]:
+        """Wait up to timeout seconds for a job to finish, then return its status"""
+        event = self.job_events.get(job_id)
+        if event is not None:
+            try:
+                await asyncio.wait_for(event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
         return self.jobs.get(job_id)
     
     def get_queue_stats(self) -> Dict[str, Any]:
@@ -267,10 +383,10 @@ class WorkerQueue:
         return {
             'active_workers': len([w for w in self.workers if not w.done()]),
             'total_workers': self.max_workers,
+            'max_concurrent_domains': self.max_concurrent_domains,
             'queued_jobs': queued_jobs,
             'active_jobs': active_jobs,
             'queue_size': self.job_queue.qsize(),
-            'priority_queue_size': len(self.priority_queue),
             'total_jobs': len(self.jobs),
             **self.stats
         }
@@ -281,19 +397,9 @@ class WorkerQueue:
         
         while self.running:
             try:
-                # Check priority queue first
-                job_data = None
-                if self.priority_queue:
-                    job_data = self.priority_queue.popleft()
-                else:
-                    # Wait for regular jobs
-                    try:
-                        job_data = await asyncio.wait_for(self.job_queue.get(), timeout=1.0)
-                    except asyncio.TimeoutError:
-                        continue
-                
-                if job_data:
-                    await self._process_job(worker_id, job_data)
+                # Highest priority first, oldest first within a priority
+                _, _, job_data = await self.job_queue.get()
+                await self._process_job(worker_id, job_data)
                     
             except Exception as e:
                 logger.error(f"Worker {worker_id} error: {e}")
@@ -323,31 +429,38 @@ class WorkerQueue:
         try:
             # Process domains using the same parallel approach
             semaphore = asyncio.Semaphore(batch_size)
+            processed = 0
             
             async def analyze_domain_with_semaphore(domain: str) -> AnalysisResponse:
-                async with semaphore:
+                nonlocal processed
+                async with semaphore, self.domain_semaphore:
                     try:
-                        return await analyzer.analyze_website(domain, timeout, job_data.get('email_priority'))
+                        return await analyzer.analyze_website(domain, timeout, job_data.get('email_priority'),
+                                                             use_cache=job_data.get('use_cache', True))
                     except asyncio.CancelledError:
                         logger.warning(f"Request cancelled for domain: {domain}")
                         return create_error_response(domain, "Request cancelled")
                     except Exception as e:
                         logger.error(f"Unexpected error for domain {domain}: {e}")
                         return create_error_response(domain, str(e))
+                    finally:
+                        # Track progress as each domain finishes
+                        processed += 1
+                        job_status.processed_domains = processed
             
-            # Create all tasks
-            tasks = [analyze_domain_with_semaphore(domain) for domain in domains]
-            
-            # Execute with progress tracking
+            # Execute chunk by chunk so only one chunk of tasks exists at a time
             results = []
-            for i, task in enumerate(asyncio.as_completed(tasks)):
-                try:
-                    result = await task
+            for i in range(0, len(domains), JOB_GATHER_CHUNK_SIZE):
+                chunk = domains[i:i + JOB_GATHER_CHUNK_SIZE]
+                chunk_results = await asyncio.gather(
+                    *(analyze_domain_with_semaphore(domain) for domain in chunk),
+                    return_exceptions=True
+                )
+                for result in chunk_results:
+                    if isinstance(result, Exception):
+                        logger.error(f"Task failed in job {job_id}: {result}")
+                        continue
                     results.append(result)
-                    job_status.processed_domains = i + 1
-                except Exception as e:
-                    logger.error(f"Task failed in job {job_id}: {e}")
-                    job_status.processed_domains = i + 1
             
             # Update job completion - convert AnalysisResponse objects to dictionaries
             job_status.results = [result.dict() if hasattr(result, 'dict') else result for result in results]
@@ -374,12 +487,263 @@ class WorkerQueue:
             job_status.error = str(e)
             job_status.completed_at = datetime.now().isoformat()
             self.stats['jobs_failed'] += 1
+        
+        finally:
+            # Wake any long-poll waiters
+            event = self.job_events.get(job_id)
+            if event is not None:
+                event.set()
 
 # Global instances
 rate_limiter = ParallelRateLimiter(max_concurrent=20, delay=0.1, burst_limit=50)
-session_pool = SessionPool(pool_size=5)
+shared_session = SharedSession(limit=500, limit_per_host=20)
 worker_queue = WorkerQueue(max_workers=10, max_queue_size=1000)
 
+# CloudFlare email decoding: one XOR translation table per key, plus the
+# non-printable bytes the decoder drops
+CF_XOR_TABLES = [bytes(b ^ key for b in range(256)) for key in range(256)]
+CF_NON_PRINTABLE = bytes(b for b in range(256) if not 32 <= b <= 126)
+
+# Extraction results memoized per analyzer instance, across all extraction
+# cores. A hit is confirmed by comparing the whole page (str hashes are cached
+# on the object), so there are no false hits; kept small because every entry
+# holds its page alive
+EXTRACT_CACHE_SIZE = 16
+
+# Pages at least this large are analyzed in a worker process so the regex work
+# doesn't stall the event loop; below it the pickling round trip costs more
+# than the scan it moves
+PROCESS_OFFLOAD_MIN_SIZE = 64 * 1024
+
+# Domains per gather in a background job, so huge jobs never hold every task at once
+JOB_GATHER_CHUNK_SIZE = 1000
+
+# Finished analyses are reused for the same domain and email priority for this
+# many seconds; the cache drops its least recently used entry beyond the size
+ANALYSIS_CACHE_TTL = 300
+ANALYSIS_CACHE_SIZE = 10000
+
+# Platform markers in the lowercased page, checked in order; the first
+# platform with any marker present wins
+PLATFORM_SIGNATURES = (
+    ('WordPress', ('wp-content', 'wordpress', '/wp-json/')),
+    ('Shopify', ('shopify',)),
+    ('Wix', ('wix.com', '_wix')),
+    ('Squarespace', ('squarespace',)),
+    ('Webflow', ('webflow',)),
+    ('React/Next.js', ('react', 'next.js', '_next/')),
+    ('Drupal', ('drupal',)),
+    ('Joomla', ('joomla',)),
+    ('Magento', ('magento', 'mage/')),
+)
+
+# All markers in one automaton, each mapped to its platform's rank
+if ahocorasick is not None:
+    PLATFORM_AUTOMATON = ahocorasick.Automaton()
+    for rank, (_, needles) in enumerate(PLATFORM_SIGNATURES):
+        for needle in needles:
+            PLATFORM_AUTOMATON.add_word(needle, rank)
+    PLATFORM_AUTOMATON.make_automaton()
+else:
+    PLATFORM_AUTOMATON = None
+
+# Free-mail providers that don't earn the company-domain bonus
+GENERIC_PROVIDERS = frozenset(['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com'])
+
+# Extraction patterns compiled once at import. They stay Unicode-aware: under
+# re.ASCII, \b would treat letters like 'ü' as non-word characters and let an
+# email match start mid-word ('müller@...' -> 'ller@...')
+EMAIL_RE = re.compile(r'\b[a-zA-Z0-9](?:[a-zA-Z0-9._%-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}\b', re.IGNORECASE)
+EMAIL_DOMAIN_RUN_RE = re.compile(r'[a-zA-Z0-9.-]*', re.IGNORECASE)
+PHONE_RE = re.compile(r'(?:\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})|(?:\+[1-9]\d{0,3}[-.\s]?)?(?:\([0-9]{1,4}\)[-.\s]?)?[0-9]{1,4}[-.\s]?[0-9]{1,9}')
+PHONE_NON_DIGIT_RE = re.compile(r'[^\d+]')
+REPEATED_DIGIT_RE = re.compile(r'^(\d)\1+$')
+# Anchors stay a regex scan rather than a DOM parse: the literal '<a' prefix
+# lets sre skip straight between anchors, which measured ~100x faster than
+# building a lexbor tree and querying a[href] on an 800 KB page
+LINK_RE = re.compile(r'<a[^>]*href=["\']([^"\']+)["\'][^>]*>([^<]+)</a>', re.IGNORECASE)
+# Every social platform in one scan: the shared scheme/www prefix is matched
+# once and the named group says which platform hit. The lookahead makes it
+# try every start position, since one platform's URL may run into the next
+# ("x.com/https://fb.com/..."); extract_social_links then keeps each
+# platform's matches non-overlapping, as a per-platform findall would
+SOCIAL_PLATFORMS = ('facebook', 'twitter', 'linkedin', 'instagram', 'youtube', 'pinterest', 'tiktok', 'whatsapp')
+SOCIAL_RE = re.compile(
+    r'(?=https?://(?:(?:www\.)?(?:'
+    r'(?P<facebook>(?:facebook\.com|fb\.com)/[a-zA-Z0-9._-]+)'
+    r'|(?P<twitter>(?:twitter\.com|x\.com)/[a-zA-Z0-9._-]+)'
+    r'|(?P<linkedin>linkedin\.com/(?:in|company)/[a-zA-Z0-9._-]+)'
+    r'|(?P<instagram>instagram\.com/[a-zA-Z0-9._-]+)'
+    r'|(?P<youtube>(?:youtube\.com/(?:channel/|user/|c/)?|youtu\.be/)[a-zA-Z0-9._-]+)'
+    r'|(?P<pinterest>pinterest\.com/[a-zA-Z0-9._-]+)'
+    r'|(?P<tiktok>tiktok\.com/@[a-zA-Z0-9._-]+)'
+    r')|(?P<whatsapp>(?:wa\.me|api\.whatsapp\.com)/[0-9]+)))',
+    re.IGNORECASE
+)
+
+# Email de-obfuscation and discovery patterns used by _extract_valid_emails
+OBFUSCATION_HINT_RE = re.compile(r'\[at\]|\(at\)|data-cfemail', re.IGNORECASE)
+CF_EMAIL_HINT_RE = re.compile(r'data-cfemail', re.IGNORECASE)
+AT_OBFUSCATION_RE = re.compile(r'\[at\]|\(at\)', re.IGNORECASE)
+DOT_OBFUSCATION_RE = re.compile(r'\[dot\]|\(dot\)', re.IGNORECASE)
+SPACED_AT_RE = re.compile(r'(\w+)\s{1,2}@\s{1,2}(\w+(?:\.\w+)*)')
+SPACED_DOT_RE = re.compile(r'(\w+@\w+)\s{1,2}\.\s{1,2}(\w+)')
+# The two patterns above start with \w+, so sre tries them at every word
+# character of the page; these fragments of them start at a literal '@' and
+# are found at memchr speed, so a page without one skips the full pass
+SPACED_AT_HINT_RE = re.compile(r'@\s{1,2}\w')
+SPACED_DOT_HINT_RE = re.compile(r'@\w+\s{1,2}\.\s{1,2}\w')
+# <span>user</span>@<span>domain.com</span>
+TAG_SPLIT_RE = re.compile(r'([a-zA-Z0-9._%-]+)</[^>]+>@<[^>]+>([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})')
+# <strong>info</strong>&#64;<strong>domain</strong>&#46;<strong>com</strong>
+NESTED_TAG_RE = re.compile(r'<[^>]*>([a-zA-Z0-9._%-]*)</[^>]*>([&#@.]*)<[^>]*>([a-zA-Z0-9._%-]*)</[^>]*>([&#@.]*)<[^>]*>([a-zA-Z0-9._%-]*)</[^>]*>')
+JS_CONCAT_RE = re.compile(r'"([a-zA-Z0-9._%-]+)"\s*\+\s*"@"\s*\+\s*"([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"')
+# Form placeholders/values, then JSON-LD and JavaScript objects ("email" keys
+# nested in a schema.org contactPoint are covered by the first JSON pattern);
+# applied one after another, each seeing what the previous ones appended
+EMBEDDED_EMAIL_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'placeholder=["\']([^"\']*@[^"\']*)["\']',
+    r'value=["\']([^"\']*@[^"\']*)["\']',
+    r'data-email=["\']([^"\']*@[^"\']*)["\']',
+    r'data-contact=["\']([^"\']*@[^"\']*)["\']',
+    r'"email"\s*:\s*"([^"]*@[^"]*)"',
+    r'email\s*=\s*["\']([^"\']*@[^"\']*)["\']',
+))
+MAILTO_PREFIX_RE = re.compile(r'^mailto:')
+EMAIL_QUOTE_CHARS_RE = re.compile(r'[<>"\']')
+CF_EMAIL_RE = re.compile(r'data-cfemail="([a-f0-9]+)"', re.IGNORECASE)
+
+# Email cleaning and validation patterns. These keep the default (Unicode)
+# flags they were always matched with, since clean_email and
+# is_valid_business_email are also called on arbitrary strings
+UNICODE_ESCAPE_RE = re.compile(r'u[0-9a-fA-F]{4}')
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+EMAIL_IN_TEXT_RE = re.compile(r'\b[a-zA-Z0-9](?:[a-zA-Z0-9._%-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}\b')
+EMAIL_FORMAT_RE = re.compile(r'^[a-zA-Z0-9](?:[a-zA-Z0-9._%-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}$')
+# Each blacklist is one alternation, so a single search replaces a loop of them
+INVALID_USERNAME_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in (
+    # File extensions in username
+    r'\.(png|jpg|jpeg|gif|svg|webp|ico|css|js|json|xml|pdf|doc|docx|xls|xlsx|zip|rar)$',
+    # Generic/placeholder patterns
+    r'^(example|test|demo|sample|placeholder|dummy|fake|mock|temp|temporary)@',
+    r'^(user|admin|root|guest|anonymous|unknown)@',
+    # Domain-only patterns
+    r'^(domain|website|site|email|mail|contact|info|support|hello)@$',
+    # Numbers-only username (4+ digits)
+    r'^[0-9]{4,}$',
+    # Very long number sequences (8+ consecutive digits)
+    r'[0-9]{8,}',
+    # Hash-like patterns (Sentry tracking IDs, etc.)
+    r'^[a-f0-9]{16,}@',
+    r'^[a-f0-9]{32}@',  # 32-character hex strings (common in tracking)
+    r'^[a-f0-9]{24}@',  # 24-character hex strings
+    r'^[a-f0-9]{40}@',  # 40-character hex strings
+    # UUID-like patterns
+    r'^[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}@',
+    # Base64-like long strings
+    r'^[A-Za-z0-9+/]{20,}@',
+    # Tracking/monitoring specific patterns
+    r'^(tracking|monitor|analytics|metric|log|debug|error|crash|report).*@.*\.(sentry|bugsnag|rollbar|airbrake)',
+)))
+INVALID_DOMAIN_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in (
+    r'\.(png|jpg|jpeg|gif|svg|webp|ico)$',  # File extensions as TLD
+    r'^(example|test|demo|sample|placeholder|dummy|fake)',  # Starts with placeholder
+    r'(localhost|127\.0\.0\.1)',  # Local addresses
+    r'sentry.*\.wixpress\.com$',  # Sentry tracking domains
+    r'.*\.sentry\.io$',  # Sentry.io subdomains
+    r'.*\.(bugsnag|rollbar|airbrake|honeybadger|raygun|crashlytics)\.com$',  # Error tracking services
+)))
+SUSPICIOUS_EMAIL_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in (
+    r'@domain\.com$',  # Literal @domain.com
+    r'@email\.com$',   # Literal @email.com
+    r'email@domain',   # email@domain pattern
+    r'user@domain',    # user@domain pattern
+    r'^[^@]+@[^@]+@',  # Multiple @ symbols
+    r'\.{2,}',         # Multiple consecutive dots
+    r'[<>"\\\[\]]',    # Invalid characters
+)))
+TRAILING_DIGITS_RE = re.compile(r'\d{3,}$')
+PERSONAL_USERNAME_RE = re.compile(r'^[a-z]+\.[a-z]+$')
+
+# Blacklisted email domains
+INVALID_EMAIL_DOMAINS = frozenset([
+    # Placeholder domains
+    'example.com', 'example.org', 'example.net',
+    'test.com', 'test.org', 'test.net',
+    'domain.com', 'website.com', 'site.com',
+    'email.com', 'mail.com', 'mysite.com',
+    'yoursite.com', 'yourdomain.com', 'mydomain.com',
+    'company.com', 'business.com', 'sample.com',
+    
+    # System/tracking domains
+    'localhost', '127.0.0.1', 'local.com',
+    'sentry.io', 'tracking.com', 'analytics.com',
+    'google-analytics.com', 'googletagmanager.com',
+    'facebook.com', 'twitter.com', 'instagram.com',
+    
+    # Sentry and error tracking domains
+    'sentry-next.wixpress.com', 'sentry.wixpress.com',
+    'bugsnag.com', 'rollbar.com', 'airbrake.io',
+    'honeybadger.io', 'raygun.com', 'crashlytics.com',
+    
+    # Generic patterns
+    'noreply.com', 'donotreply.com', 'no-reply.com',
+    
+    # File-like domains
+    'png.com', 'jpg.com', 'gif.com', 'webp.com',
+])
+
+# Blacklisted email usernames
+INVALID_EMAIL_USERNAMES = frozenset([
+    # Exact matches
+    'example', 'test', 'demo', 'sample', 'placeholder', 'dummy', 'fake',
+    'user', 'admin', 'root', 'guest', 'anonymous', 'unknown',
+    'domain', 'website', 'site', 'email', 'mail',
+    'noreply', 'no-reply', 'donotreply', 'do-not-reply',
+    'mailer-daemon', 'postmaster', 'bounce', 'return',
+    
+    # System accounts (but allow legitimate business emails like 'support', 'info', 'contact')
+    'system', 'daemon', 'nobody', 'www', 'ftp', 'apache', 'nginx',
+    'mysql', 'postgres', 'redis', 'mongodb',
+    
+    # Marketing/tracking
+    'tracking', 'analytics', 'pixel', 'tag', 'monitor',
+    'newsletter', 'marketing',
+    'promotion', 'promo', 'deals', 'offer', 'discount',
+])
+
+# SEO checks
+TITLE_RE = re.compile(r'<title[^>]*>([^<]*)</title>', re.IGNORECASE)
+META_DESCRIPTION_RE = re.compile(r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']*)["\']', re.IGNORECASE)
+H1_RE = re.compile(r'<h1[^>]*>', re.IGNORECASE)
+H2_RE = re.compile(r'<h2[^>]*>', re.IGNORECASE)
+VIEWPORT_RE = re.compile(r'name=["\']viewport["\']', re.IGNORECASE)
+CANONICAL_RE = re.compile(r'rel=["\']canonical["\']', re.IGNORECASE)
+ROBOTS_RE = re.compile(r'name=["\']robots["\']', re.IGNORECASE)
+STRUCTURED_DATA_RE = re.compile(r'application/ld\+json|schema\.org', re.IGNORECASE)
+OPEN_GRAPH_RE = re.compile(r'property=["\']og:', re.IGNORECASE)
+TWITTER_CARD_RE = re.compile(r'name=["\']twitter:', re.IGNORECASE)
+LAZY_LOADING_RE = re.compile(r'loading=["\']lazy["\']', re.IGNORECASE)
+PRELOAD_RE = re.compile(r'rel=["\']preload["\']', re.IGNORECASE)
+ALT_ATTR_RE = re.compile(r'alt=', re.IGNORECASE)
+LANG_ATTR_RE = re.compile(r'lang=', re.IGNORECASE)
+
+def memoize_extraction(method):
+    """Memoize an extraction core in its analyzer's own bounded extract_cache"""
+    @wraps(method)
+    def wrapper(self, *args):
+        key = (method.__name__, *args)
+        cache = self.extract_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        
+        result = cache[key] = method(self, *args)
+        if len(cache) > EXTRACT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
+    return wrapper
+
 # Website analyzer class
 class WebsiteAnalyzer:
     def __init__(self):
@@ -391,10 +755,60 @@ class WebsiteAnalyzer:
         
         # Minimal blacklist patterns for email filtering (moved to extract_emails method)
         
-        self.generic_usernames = [
+        self.generic_usernames = frozenset([
             'info', 'admin', 'support', 'contact', 'help', 'sales', 'service',
             'team', 'hello', 'mail', 'email', 'newsletter', 'webmaster'
-        ]
+        ])
+        
+        # Worker processes for large pages, started on first use
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+        
+        # (extraction core, page, args) -> result, least recently used first
+        self.extract_cache: OrderedDict = OrderedDict()
+        
+        # (domain, timeout, email priority) -> (finished at, result), least recently used first
+        self.analysis_cache: OrderedDict = OrderedDict()
+        # Analyses in progress on the shared session -> [task, callers waiting on it],
+        # so concurrent requests for a domain share one fetch
+        self.analysis_inflight: Dict[Tuple[str, int, Tuple[str, ...]], List[Any]] = {}
+
+    def get_process_pool(self) -> ProcessPoolExecutor:
+        if self.process_pool is None:
+            # Spawned rather than forked: the server process runs threads, and
+            # a forked child could inherit a lock held by one of them
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self.process_pool
+
+    def shutdown_process_pool(self):
+        if self.process_pool is not None:
+            self.process_pool.shutdown(cancel_futures=True)
+            self.process_pool = None
+
+    async def run_page_analysis(self, method, html: str, *args):
+        """Call method(analyzer, html, *args), in a worker process when the page is large"""
+        if len(html) < PROCESS_OFFLOAD_MIN_SIZE:
+            return method(self, html, *args)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.get_process_pool(), run_with_worker_analyzer, method, html, *args)
+
+    def analyze_page(self, html: str, base_url: str, email_priority: List[str] = None) -> Dict[str, Any]:
+        """All CPU-bound analysis of a fetched page"""
+        seo_data = self.analyze_seo(html)
+        seo_score, seo_grade = self.calculate_seo_score(seo_data)
+        return {
+            'platform': self.detect_platform(html),
+            'seo_data': seo_data,
+            'seo_score': seo_score,
+            'seo_grade': seo_grade,
+            'emails': self.extract_emails(html, email_priority),
+            'phones': self.extract_phones(html),
+            'contact_pages': self.extract_contact_pages(html, base_url),
+            'social_links': self.extract_social_links(html),
+        }
 
     async def fetch_website(self, session: aiohttp.ClientSession, domain: str, timeout: int = 15) -> Dict[str, Any]:
         """Fetch website content with proper error handling, SSL fallback and parallel optimizations"""
@@ -422,31 +836,21 @@ class WebsiteAnalyzer:
         
         for url in urls_to_try:
             try:
-                await rate_limiter.acquire()
-                
-                async with session.get(
+                async with rate_limiter, session.get(
                     url,
                     headers=headers,
                     timeout=aiohttp.ClientTimeout(total=timeout),
                     allow_redirects=True,
                     max_redirects=3,
-                    compress=True,  # Enable compression handling
                     ssl=False  # Disable SSL verification at request level too
                 ) as response:
-                    # Try to read content with proper encoding handling
+                    # Read the body once and decode it in a single step; with
+                    # errors='ignore' decoding can't fail, only the read can
                     try:
-                        content = await response.text(encoding='utf-8', errors='ignore')
-                    except UnicodeDecodeError:
-                        # Fallback to reading as bytes and decode manually
-                        raw_content = await response.read()
-                        content = raw_content.decode('utf-8', errors='ignore')
-                    except Exception as decode_error:
-                        # Last resort: try reading without encoding specification
-                        try:
-                            content = await response.text(errors='ignore')
-                        except:
-                            logger.warning(f"Failed to decode content for {url}: {decode_error}")
-                            content = ""
+                        content = (await response.read()).decode('utf-8', errors='ignore')
+                    except Exception as read_error:
+                        logger.warning(f"Failed to read content for {url}: {read_error}")
+                        content = ""
                     
                     # Success! Return the result
                     return {
@@ -469,8 +873,6 @@ class WebsiteAnalyzer:
                 last_error = f'Unexpected error for {url}: {str(e)}'
                 logger.warning(f"Unexpected error accessing {url}: {e}")
                 continue  # Try next URL
-            finally:
-                rate_limiter.release()
         
         # If we get here, all URLs failed
         return {
@@ -482,88 +884,79 @@ class WebsiteAnalyzer:
         """Detect website platform"""
         html_lower = html.lower()
         
-        if 'wp-content' in html_lower or 'wordpress' in html_lower or '/wp-json/' in html_lower:
-            return 'WordPress'
-        elif 'shopify' in html_lower or 'cdn.shopify.com' in html_lower:
-            return 'Shopify'
-        elif 'wix.com' in html_lower or '_wix' in html_lower:
-            return 'Wix'
-        elif 'squarespace' in html_lower or 'squarespace.com' in html_lower:
-            return 'Squarespace'
-        elif 'webflow' in html_lower or 'webflow.com' in html_lower:
-            return 'Webflow'
-        elif 'react' in html_lower or 'next.js' in html_lower or '_next/' in html_lower:
-            return 'React/Next.js'
-        elif 'drupal' in html_lower:
-            return 'Drupal'
-        elif 'joomla' in html_lower:
-            return 'Joomla'
-        elif 'magento' in html_lower or 'mage/' in html_lower:
-            return 'Magento'
-        else:
-            return 'Unknown'
+        if PLATFORM_AUTOMATON is not None:
+            # One scan for every marker; keep the best-ranked hit, stopping early
+            # at a first-rank one
+            best = len(PLATFORM_SIGNATURES)
+            for _, rank in PLATFORM_AUTOMATON.iter(html_lower):
+                if rank < best:
+                    best = rank
+                    if rank == 0:
+                        break
+            return PLATFORM_SIGNATURES[best][0] if best < len(PLATFORM_SIGNATURES) else 'Unknown'
+        
+        for platform, needles in PLATFORM_SIGNATURES:
+            if any(needle in html_lower for needle in needles):
+                return platform
+        return 'Unknown'
 
     def extract_emails(self, html: str, email_priority: List[str] = None) -> List[str]:
         """Extract and validate email addresses with enhanced obfuscation handling"""
+        # Score and sort emails by quality with priority
+        scored_emails = []
+        for email in self._extract_valid_emails(html):
+            score = self.score_email(email, email_priority)
+            scored_emails.append((email, score))
+            
+        scored_emails.sort(key=lambda x: x[1], reverse=True)
+        return [email for email, score in scored_emails[:5]]  # Return top 5 to show priority effects
+
+    @memoize_extraction
+    def _extract_valid_emails(self, html: str) -> Tuple[str, ...]:
+        """Valid business emails on the page in page order, before priority scoring"""
+        # Skip pages with no '@' and nothing that could decode to one
+        if ('@' not in html and '&' not in html and
+                not OBFUSCATION_HINT_RE.search(html)):
+            return ()
+        
         # First, handle common obfuscation methods
         processed_html = html
         
         # Decode HTML entities (including numeric)
-        import html
-        processed_html = html.unescape(processed_html)  # Handle all HTML entities
+        processed_html = html_module.unescape(processed_html)  # Handle all HTML entities
         
         # Additional manual replacements for common patterns
         processed_html = processed_html.replace('&at;', '@').replace('&dot;', '.')
         
-        # Handle [at] and [dot] obfuscation
-        processed_html = re.sub(r'\[at\]', '@', processed_html, flags=re.IGNORECASE)
-        processed_html = re.sub(r'\[dot\]', '.', processed_html, flags=re.IGNORECASE)
-        processed_html = re.sub(r'\(at\)', '@', processed_html, flags=re.IGNORECASE)
-        processed_html = re.sub(r'\(dot\)', '.', processed_html, flags=re.IGNORECASE)
+        # Handle [at]/(at) and [dot]/(dot) obfuscation
+        processed_html = AT_OBFUSCATION_RE.sub('@', processed_html)
+        processed_html = DOT_OBFUSCATION_RE.sub('.', processed_html)
+        
+        # Every remaining extraction path needs an '@' or a CloudFlare-protected address
+        if '@' not in processed_html and not CF_EMAIL_HINT_RE.search(processed_html):
+            return ()
         
         # Handle spaced emails (up to 2 spaces around @ and .)
-        processed_html = re.sub(r'(\w+)\s{1,2}@\s{1,2}(\w+(?:\.\w+)*)', r'\1@\2', processed_html)
-        processed_html = re.sub(r'(\w+@\w+)\s{1,2}\.\s{1,2}(\w+)', r'\1.\2', processed_html)
+        if SPACED_AT_HINT_RE.search(processed_html):
+            processed_html = SPACED_AT_RE.sub(r'\1@\2', processed_html)
+        if SPACED_DOT_HINT_RE.search(processed_html):
+            processed_html = SPACED_DOT_RE.sub(r'\1.\2', processed_html)
         
         # Remove HTML tags that might split emails
-        # Handle cases like <span>user</span>@<span>domain.com</span>
-        tag_split_pattern = r'([a-zA-Z0-9._%-]+)</[^>]+>@<[^>]+>([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-        processed_html = re.sub(tag_split_pattern, r'\1@\2', processed_html)
+        if '>@<' in processed_html:
+            processed_html = TAG_SPLIT_RE.sub(r'\1@\2', processed_html)
         
-        # Handle more complex HTML tag splitting like <strong>info</strong>&#64;<strong>domain</strong>&#46;<strong>com</strong>
-        # First clean up nested tags around email parts
-        nested_pattern = r'<[^>]*>([a-zA-Z0-9._%-]*)</[^>]*>([&#@.]*)<[^>]*>([a-zA-Z0-9._%-]*)</[^>]*>([&#@.]*)<[^>]*>([a-zA-Z0-9._%-]*)</[^>]*>'
-        processed_html = re.sub(nested_pattern, r'\1\2\3\4\5', processed_html)
+        # Handle more complex HTML tag splitting: first clean up nested tags around email parts
+        processed_html = NESTED_TAG_RE.sub(r'\1\2\3\4\5', processed_html)
         
         # Handle JavaScript-style string concatenation for emails
-        js_concat_pattern = r'"([a-zA-Z0-9._%-]+)"\s*\+\s*"@"\s*\+\s*"([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"'
-        js_matches = re.findall(js_concat_pattern, processed_html)
+        js_matches = JS_CONCAT_RE.findall(processed_html) if '"@"' in processed_html else []
         for username, domain in js_matches:
             processed_html += f' {username}@{domain} '  # Add reconstructed email to processed HTML
         
-        # Look for emails in form placeholders and values
-        form_patterns = [
-            r'placeholder=["\']([^"\']*@[^"\']*)["\']',
-            r'value=["\']([^"\']*@[^"\']*)["\']',
-            r'data-email=["\']([^"\']*@[^"\']*)["\']',
-            r'data-contact=["\']([^"\']*@[^"\']*)["\']'
-        ]
-        
-        for pattern in form_patterns:
-            form_matches = re.findall(pattern, processed_html, re.IGNORECASE)
-            for match in form_matches:
-                processed_html += f' {match} '
-        
-        # Look for emails in JSON-LD structured data and JavaScript objects
-        json_patterns = [
-            r'"email"\s*:\s*"([^"]*@[^"]*)"',
-            r'"contactPoint"\s*:.*?"email"\s*:\s*"([^"]*@[^"]*)"',
-            r'email\s*=\s*["\']([^"\']*@[^"\']*)["\']'
-        ]
-        
-        for pattern in json_patterns:
-            json_matches = re.findall(pattern, processed_html, re.IGNORECASE)
-            for match in json_matches:
+        # Look for emails in form fields, JSON-LD structured data and JavaScript objects
+        for pattern in EMBEDDED_EMAIL_PATTERNS:
+            for match in pattern.findall(processed_html):
                 processed_html += f' {match} '
         
         # Handle CloudFlare Email Protection
@@ -572,8 +965,7 @@ class WebsiteAnalyzer:
             processed_html += f' {email} '
         
         # More comprehensive email regex
-        email_regex = r'\b[a-zA-Z0-9](?:[a-zA-Z0-9._%-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}\b'
-        email_matches = re.findall(email_regex, processed_html, re.IGNORECASE)
+        email_matches = self.find_emails_near_at(processed_html, EMAIL_RE)
         
         # Remove duplicates with enhanced normalization
         unique_emails = []
@@ -583,8 +975,8 @@ class WebsiteAnalyzer:
             normalized_email = email.lower().strip()
             
             # Remove common variations that should be considered duplicates
-            normalized_email = re.sub(r'^mailto:', '', normalized_email)
-            normalized_email = re.sub(r'[<>"\']', '', normalized_email)
+            normalized_email = MAILTO_PREFIX_RE.sub('', normalized_email)
+            normalized_email = EMAIL_QUOTE_CHARS_RE.sub('', normalized_email)
             
             if normalized_email not in seen_emails and len(normalized_email) > 0:
                 seen_emails.add(normalized_email)
@@ -603,14 +995,36 @@ class WebsiteAnalyzer:
             if self.is_valid_business_email(email):
                 valid_emails.append(email)
                 
-        # Score and sort emails by quality with priority
-        scored_emails = []
-        for email in valid_emails:
-            score = self.score_email(email, email_priority)
-            scored_emails.append((email, score))
+        return tuple(valid_emails)
+
+    def find_emails_near_at(self, text: str, email_pattern: re.Pattern) -> List[str]:
+        """Same result as email_pattern.findall(text), scanning only the character runs around each '@'"""
+        # IGNORECASE also folds \u0130, \u0131, \u017f and \u212a into [a-zA-Z]
+        local_chars = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%-\u0130\u0131\u017f\u212a'
+        
+        matches = []
+        last_end = 0
+        at = text.find('@')
+        while at != -1:
+            # Walk back over the local part, never into the previous match
+            lo = at
+            while True:
+                start = max(last_end, lo - 64)
+                stripped = text[start:lo].rstrip(local_chars)
+                lo = start + len(stripped)
+                if stripped or start == last_end:
+                    break
             
-        scored_emails.sort(key=lambda x: x[1], reverse=True)
-        return [email for email, score in scored_emails[:5]]  # Return top 5 to show priority effects
+            # Include one character past the domain run so the trailing \b sees it
+            hi = EMAIL_DOMAIN_RUN_RE.match(text, at + 1).end()
+            match = email_pattern.search(text, lo, min(hi + 1, len(text)))
+            if match:
+                matches.append(match.group(0))
+                last_end = match.end()
+            
+            at = text.find('@', at + 1)
+        
+        return matches
 
     def clean_email(self, email: str) -> str:
         """Clean email address by removing prefixes, suffixes, and invalid characters"""
@@ -620,10 +1034,10 @@ class WebsiteAnalyzer:
         email = email.strip()
         
         # Remove Unicode escape sequences like u003e
-        email = re.sub(r'u[0-9a-fA-F]{4}', '', email)
+        email = UNICODE_ESCAPE_RE.sub('', email)
         
         # Remove HTML tags and entities that might be around emails
-        email = re.sub(r'<[^>]+>', '', email)
+        email = HTML_TAG_RE.sub('', email)
         email = email.replace('&lt;', '').replace('&gt;', '')
         email = email.replace('&quot;', '').replace('&#34;', '')
         email = email.replace('&apos;', '').replace('&#39;', '')
@@ -645,7 +1059,7 @@ class WebsiteAnalyzer:
                 email = email[:-len(prefix)].strip()
         
         # Extract just the email part if there's extra text
-        email_match = re.search(r'\b[a-zA-Z0-9](?:[a-zA-Z0-9._%-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}\b', email)
+        email_match = EMAIL_IN_TEXT_RE.search(email)
         if email_match:
             email = email_match.group(0)
         
@@ -663,124 +1077,30 @@ class WebsiteAnalyzer:
             return False
             
         # Must have proper email format
-        if not re.match(r'^[a-zA-Z0-9](?:[a-zA-Z0-9._%-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}$', email_lower):
+        if not EMAIL_FORMAT_RE.match(email_lower):
             return False
         
         username, domain = email_lower.split('@', 1)
         
         # Extended blacklist of invalid patterns
-        invalid_patterns = [
-            # File extensions in username
-            r'\.(png|jpg|jpeg|gif|svg|webp|ico|css|js|json|xml|pdf|doc|docx|xls|xlsx|zip|rar)$',
-            # Generic/placeholder patterns
-            r'^(example|test|demo|sample|placeholder|dummy|fake|mock|temp|temporary)@',
-            r'^(user|admin|root|guest|anonymous|unknown)@',
-            # Domain-only patterns
-            r'^(domain|website|site|email|mail|contact|info|support|hello)@$',
-            # Numbers-only username (4+ digits)
-            r'^[0-9]{4,}$',
-            # Very long number sequences (8+ consecutive digits)
-            r'[0-9]{8,}',
-            # Hash-like patterns (Sentry tracking IDs, etc.)
-            r'^[a-f0-9]{16,}@',
-            r'^[a-f0-9]{32}@',  # 32-character hex strings (common in tracking)
-            r'^[a-f0-9]{24}@',  # 24-character hex strings
-            r'^[a-f0-9]{40}@',  # 40-character hex strings
-            # UUID-like patterns
-            r'^[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}@',
-            # Base64-like long strings
-            r'^[A-Za-z0-9+/]{20,}@',
-            # Tracking/monitoring specific patterns
-            r'^(tracking|monitor|analytics|metric|log|debug|error|crash|report).*@.*\.(sentry|bugsnag|rollbar|airbrake)',
-        ]
-        
-        for pattern in invalid_patterns:
-            if re.search(pattern, username):
-                return False
-        
-        # Blacklisted domains
-        invalid_domains = [
-            # Placeholder domains
-            'example.com', 'example.org', 'example.net',
-            'test.com', 'test.org', 'test.net',
-            'domain.com', 'website.com', 'site.com',
-            'email.com', 'mail.com', 'mysite.com',
-            'yoursite.com', 'yourdomain.com', 'mydomain.com',
-            'company.com', 'business.com', 'sample.com',
-            
-            # System/tracking domains
-            'localhost', '127.0.0.1', 'local.com',
-            'sentry.io', 'tracking.com', 'analytics.com',
-            'google-analytics.com', 'googletagmanager.com',
-            'facebook.com', 'twitter.com', 'instagram.com',
-            
-            # Sentry and error tracking domains
-            'sentry-next.wixpress.com', 'sentry.wixpress.com',
-            'bugsnag.com', 'rollbar.com', 'airbrake.io',
-            'honeybadger.io', 'raygun.com', 'crashlytics.com',
-            
-            # Generic patterns
-            'noreply.com', 'donotreply.com', 'no-reply.com',
-            
-            # File-like domains
-            'png.com', 'jpg.com', 'gif.com', 'webp.com',
-        ]
+        if INVALID_USERNAME_RE.search(username):
+            return False
         
         # Check exact domain matches
-        if domain in invalid_domains:
+        if domain in INVALID_EMAIL_DOMAINS:
             return False
             
         # Check domain patterns
-        invalid_domain_patterns = [
-            r'\.(png|jpg|jpeg|gif|svg|webp|ico)$',  # File extensions as TLD
-            r'^(example|test|demo|sample|placeholder|dummy|fake)',  # Starts with placeholder
-            r'(localhost|127\.0\.0\.1)',  # Local addresses
-            r'sentry.*\.wixpress\.com$',  # Sentry tracking domains
-            r'.*\.sentry\.io$',  # Sentry.io subdomains
-            r'.*\.(bugsnag|rollbar|airbrake|honeybadger|raygun|crashlytics)\.com$',  # Error tracking services
-        ]
-        
-        for pattern in invalid_domain_patterns:
-            if re.search(pattern, domain):
-                return False
-        
-        # Additional username validations
-        invalid_usernames = [
-            # Exact matches
-            'example', 'test', 'demo', 'sample', 'placeholder', 'dummy', 'fake',
-            'user', 'admin', 'root', 'guest', 'anonymous', 'unknown',
-            'domain', 'website', 'site', 'email', 'mail',
-            'noreply', 'no-reply', 'donotreply', 'do-not-reply',
-            'mailer-daemon', 'postmaster', 'bounce', 'return',
-            
-            # System accounts (but allow legitimate business emails like 'support', 'info', 'contact')
-            'system', 'daemon', 'nobody', 'www', 'ftp', 'apache', 'nginx',
-            'mysql', 'postgres', 'redis', 'mongodb',
-            
-            # Marketing/tracking
-            'tracking', 'analytics', 'pixel', 'tag', 'monitor',
-            'newsletter', 'marketing',
-            'promotion', 'promo', 'deals', 'offer', 'discount',
-        ]
+        if INVALID_DOMAIN_RE.search(domain):
+            return False
         
         # Check if username is in blacklist
-        if username in invalid_usernames:
+        if username in INVALID_EMAIL_USERNAMES:
             return False
         
         # Check for suspicious patterns in full email
-        suspicious_full_patterns = [
-            r'@domain\.com$',  # Literal @domain.com
-            r'@email\.com$',   # Literal @email.com
-            r'email@domain',   # email@domain pattern
-            r'user@domain',    # user@domain pattern
-            r'^[^@]+@[^@]+@',  # Multiple @ symbols
-            r'\.{2,}',         # Multiple consecutive dots
-            r'[<>"\\\[\]]',    # Invalid characters
-        ]
-        
-        for pattern in suspicious_full_patterns:
-            if re.search(pattern, email_lower):
-                return False
+        if SUSPICIOUS_EMAIL_RE.search(email_lower):
+            return False
         
         return True
 
@@ -821,16 +1141,15 @@ class WebsiteAnalyzer:
             score -= 20  # Reduced penalty
             
         # Penalize numbers at end (less strict)
-        if re.search(r'\d{3,}$', username):  # Only penalize 3+ digits
+        if TRAILING_DIGITS_RE.search(username):  # Only penalize 3+ digits
             score -= 10
             
         # Bonus for personal-looking emails
-        if re.match(r'^[a-z]+\.[a-z]+$', username) and len(username) > 3:
+        if PERSONAL_USERNAME_RE.match(username) and len(username) > 3:
             score += 30
             
         # Bonus for non-generic providers (but lower if in priority list)
-        generic_providers = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com']
-        if domain not in generic_providers:
+        if domain not in GENERIC_PROVIDERS:
             score += 25  # Increased bonus for company domains
             
         # Extra bonus for common business email patterns (if not already covered by priority)
@@ -845,8 +1164,7 @@ class WebsiteAnalyzer:
         emails = []
         
         # Find all CloudFlare encrypted emails
-        cf_pattern = r'data-cfemail="([a-f0-9]+)"'
-        cf_matches = re.findall(cf_pattern, html, re.IGNORECASE)
+        cf_matches = CF_EMAIL_RE.findall(html)
         
         for encrypted in cf_matches:
             try:
@@ -854,18 +1172,11 @@ class WebsiteAnalyzer:
                 # First two characters are the key, rest is the encrypted email
                 if len(encrypted) >= 2:
                     key = int(encrypted[:2], 16)
-                    encrypted_email = encrypted[2:]
-                    
-                    # Decode by XORing each pair of hex characters with the key
-                    decoded_chars = []
-                    for i in range(0, len(encrypted_email), 2):
-                        if i + 1 < len(encrypted_email):
-                            hex_pair = encrypted_email[i:i+2]
-                            char_code = int(hex_pair, 16) ^ key
-                            if 32 <= char_code <= 126:  # Printable ASCII
-                                decoded_chars.append(chr(char_code))
+                    # Ignore a trailing unpaired hex character
+                    encrypted_email = bytes.fromhex(encrypted[2:len(encrypted) - len(encrypted) % 2])
                     
-                    decoded_email = ''.join(decoded_chars)
+                    # Decode by XORing every byte with the key, keeping printable ASCII only
+                    decoded_email = encrypted_email.translate(CF_XOR_TABLES[key]).translate(None, CF_NON_PRINTABLE).decode('ascii')
                     
                     # Validate that it looks like an email
                     if '@' in decoded_email and '.' in decoded_email:
@@ -926,7 +1237,7 @@ class WebsiteAnalyzer:
                         logger.info(f"Successfully fetched contact page: {contact_url}")
                         
                         # Extract emails from contact page
-                        page_emails = self.extract_emails(content, email_priority)
+                        page_emails = await self.run_page_analysis(WebsiteAnalyzer.extract_emails, content, email_priority)
                         if page_emails:
                             logger.info(f"Found {len(page_emails)} emails on contact page")
                             contact_emails.extend(page_emails)
@@ -943,8 +1254,12 @@ class WebsiteAnalyzer:
 
     def extract_phones(self, html: str) -> List[str]:
         """Extract and validate phone numbers"""
-        phone_regex = r'(?:\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})|(?:\+[1-9]\d{0,3}[-.\s]?)?(?:\([0-9]{1,4}\)[-.\s]?)?[0-9]{1,4}[-.\s]?[0-9]{1,9}'
-        phone_matches = re.findall(phone_regex, html)
+        return list(self._extract_phones(html))
+
+    @memoize_extraction
+    def _extract_phones(self, html: str) -> Tuple[str, ...]:
+        """Up to two valid phone numbers on the page"""
+        phone_matches = PHONE_RE.findall(html)
         
         valid_phones = []
         for match in phone_matches:
@@ -953,25 +1268,29 @@ class WebsiteAnalyzer:
             else:
                 phone = match
                 
-            clean_phone = re.sub(r'[^\d+]', '', phone)
+            clean_phone = PHONE_NON_DIGIT_RE.sub('', phone)
             
             if (len(clean_phone) >= 10 and len(clean_phone) <= 15 and 
                 '1234567890' not in clean_phone and
-                not re.match(r'^(\d)\1+$', clean_phone)):
+                not REPEATED_DIGIT_RE.match(clean_phone)):
                 valid_phones.append(phone)
                 
-        return list(set(valid_phones))[:2]
+        return tuple(set(valid_phones))[:2]
 
     def extract_contact_pages(self, html: str, base_url: str) -> List[Dict[str, str]]:
         """Extract contact page URLs"""
+        return [{'url': url, 'linkText': link_text} for url, link_text in self._extract_contact_pages(html, base_url)]
+
+    @memoize_extraction
+    def _extract_contact_pages(self, html: str, base_url: str) -> Tuple[Tuple[str, str], ...]:
+        """Unique contact page (url, link text) pairs on the page"""
         contact_keywords = [
             'contact', 'contact us', 'contact-us', 'get in touch', 'reach out',
             'connect', 'inquiry', 'support', 'help'
         ]
         
         # Find all anchor tags
-        link_pattern = r'<a[^>]*href=["\']([^"\']+)["\'][^>]*>([^<]+)</a>'
-        links = re.findall(link_pattern, html, re.IGNORECASE)
+        links = LINK_RE.findall(html)
         
         contact_pages = []
         for href, text in links:
@@ -993,78 +1312,74 @@ class WebsiteAnalyzer:
                 else:
                     full_url = href
                     
-                contact_pages.append({
-                    'url': full_url,
-                    'linkText': text.strip()
-                })
+                contact_pages.append((full_url, text.strip()))
                 
         # Remove duplicates
         seen_urls = set()
         unique_pages = []
         for page in contact_pages:
-            normalized_url = page['url'].rstrip('/')
+            normalized_url = page[0].rstrip('/')
             if normalized_url not in seen_urls:
                 seen_urls.add(normalized_url)
                 unique_pages.append(page)
                 
-        return unique_pages
+        return tuple(unique_pages)
 
     def extract_social_links(self, html: str) -> Dict[str, List[str]]:
         """Extract social media links"""
-        social_patterns = {
-            'facebook': r'https?://(?:www\.)?(?:facebook\.com|fb\.com)/[a-zA-Z0-9._-]+',
-            'twitter': r'https?://(?:www\.)?(?:twitter\.com|x\.com)/[a-zA-Z0-9._-]+',
-            'linkedin': r'https?://(?:www\.)?linkedin\.com/(?:in|company)/[a-zA-Z0-9._-]+',
-            'instagram': r'https?://(?:www\.)?instagram\.com/[a-zA-Z0-9._-]+',
-            'youtube': r'https?://(?:www\.)?(?:youtube\.com/(?:channel/|user/|c/)?|youtu\.be/)[a-zA-Z0-9._-]+',
-            'pinterest': r'https?://(?:www\.)?pinterest\.com/[a-zA-Z0-9._-]+',
-            'tiktok': r'https?://(?:www\.)?tiktok\.com/@[a-zA-Z0-9._-]+',
-            'whatsapp': r'https?://(?:wa\.me|api\.whatsapp\.com)/[0-9]+'
-        }
-        
-        social_links = {}
-        for platform, pattern in social_patterns.items():
-            matches = re.findall(pattern, html, re.IGNORECASE)
-            social_links[platform] = list(set(matches))
-            
-        return social_links
+        return {platform: list(links) for platform, links in self._extract_social_links(html)}
+
+    @memoize_extraction
+    def _extract_social_links(self, html: str) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+        """(platform, unique links) pairs for every social platform"""
+        found = {platform: set() for platform in SOCIAL_PLATFORMS}
+        ends = dict.fromkeys(SOCIAL_PLATFORMS, 0)
+        for match in SOCIAL_RE.finditer(html):
+            platform = match.lastgroup
+            start = match.start()
+            if start >= ends[platform]:
+                end = match.end(platform)
+                found[platform].add(html[start:end])
+                ends[platform] = end
+        
+        return tuple((platform, tuple(matches)) for platform, matches in found.items())
 
     def analyze_seo(self, html: str) -> Dict[str, Any]:
         """Analyze SEO elements"""
         # Title analysis
-        title_match = re.search(r'<title[^>]*>([^<]*)</title>', html, re.IGNORECASE)
+        title_match = TITLE_RE.search(html)
         has_title = bool(title_match)
         title_length = len(title_match.group(1).strip()) if title_match else 0
         title_optimal = 30 <= title_length <= 60
         
         # Meta description
-        desc_match = re.search(r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']*)["\']', html, re.IGNORECASE)
+        desc_match = META_DESCRIPTION_RE.search(html)
         has_description = bool(desc_match)
         desc_length = len(desc_match.group(1).strip()) if desc_match else 0
         desc_optimal = 120 <= desc_length <= 160
         
         # Headers
-        has_h1 = bool(re.search(r'<h1[^>]*>', html, re.IGNORECASE))
-        h1_count = len(re.findall(r'<h1[^>]*>', html, re.IGNORECASE))
-        has_h2 = bool(re.search(r'<h2[^>]*>', html, re.IGNORECASE))
+        has_h1 = bool(H1_RE.search(html))
+        h1_count = len(H1_RE.findall(html))
+        has_h2 = bool(H2_RE.search(html))
         
         # Technical SEO
-        has_viewport = bool(re.search(r'name=["\']viewport["\']', html, re.IGNORECASE))
-        has_canonical = bool(re.search(r'rel=["\']canonical["\']', html, re.IGNORECASE))
-        has_robots = bool(re.search(r'name=["\']robots["\']', html, re.IGNORECASE))
-        has_structured_data = bool(re.search(r'application/ld\+json|schema\.org', html, re.IGNORECASE))
+        has_viewport = bool(VIEWPORT_RE.search(html))
+        has_canonical = bool(CANONICAL_RE.search(html))
+        has_robots = bool(ROBOTS_RE.search(html))
+        has_structured_data = bool(STRUCTURED_DATA_RE.search(html))
         
         # Social meta tags
-        has_og = bool(re.search(r'property=["\']og:', html, re.IGNORECASE))
-        has_twitter = bool(re.search(r'name=["\']twitter:', html, re.IGNORECASE))
+        has_og = bool(OPEN_GRAPH_RE.search(html))
+        has_twitter = bool(TWITTER_CARD_RE.search(html))
         
         # Performance
-        has_lazy_loading = bool(re.search(r'loading=["\']lazy["\']', html, re.IGNORECASE))
-        has_preload = bool(re.search(r'rel=["\']preload["\']', html, re.IGNORECASE))
+        has_lazy_loading = bool(LAZY_LOADING_RE.search(html))
+        has_preload = bool(PRELOAD_RE.search(html))
         
         # Accessibility
-        has_alt_tags = bool(re.search(r'alt=', html, re.IGNORECASE))
-        has_lang = bool(re.search(r'lang=', html, re.IGNORECASE))
+        has_alt_tags = bool(ALT_ATTR_RE.search(html))
+        has_lang = bool(LANG_ATTR_RE.search(html))
         
         return {
             'hasTitle': 'Yes' if has_title else 'No',
@@ -1118,12 +1433,74 @@ class WebsiteAnalyzer:
         grade = 'A' if score >= 80 else 'B' if score >= 60 else 'C' if score >= 40 else 'D'
         return score, grade
 
-    async def analyze_website(self, domain: str, timeout: int = 15, email_priority: List[str] = None) -> AnalysisResponse:
+    async def analyze_website(self, domain: str, timeout: int = 15, email_priority: List[str] = None,
+                              session: Optional[aiohttp.ClientSession] = None, use_cache: bool = True) -> AnalysisResponse:
+        """Analyze a domain, reusing a recent result or an analysis already in progress unless use_cache is False"""
+        if not use_cache:
+            return await self._analyze_website(domain, timeout, email_priority, session)
+        
+        key = (domain, timeout, tuple(email_priority or ()))
+        
+        cached = self.analysis_cache.get(key)
+        if cached is not None:
+            finished_at, result = cached
+            if time.monotonic() - finished_at < ANALYSIS_CACHE_TTL:
+                self.analysis_cache.move_to_end(key)
+                return result
+            del self.analysis_cache[key]
+        
+        # A caller's own session is only used for that caller's analysis
+        if session is not None:
+            result = await self._analyze_website(domain, timeout, email_priority, session)
+            self._store_analysis(key, result)
+            return result
+        
+        entry = self.analysis_inflight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(self._analyze_website(domain, timeout, email_priority, None))
+            entry = self.analysis_inflight[key] = [task, 0]
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        
+        task = entry[0]
+        entry[1] += 1
+        try:
+            # Shielded so one cancelled caller doesn't cancel the analysis for the others
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            # Once every caller is gone the analysis stops too, so it never runs
+            # outside the concurrency limit its callers were holding
+            if entry[1] == 0 and not task.done():
+                task.cancel()
+                if self.analysis_inflight.get(key) is entry:
+                    del self.analysis_inflight[key]
+    
+    def _finish_inflight(self, key: Tuple[str, int, Tuple[str, ...]], task: asyncio.Task):
+        """Retire a shared analysis and cache its result"""
+        entry = self.analysis_inflight.get(key)
+        if entry is not None and entry[0] is task:
+            del self.analysis_inflight[key]
+        if not task.cancelled() and task.exception() is None:
+            self._store_analysis(key, task.result())
+    
+    def _store_analysis(self, key: Tuple[str, int, Tuple[str, ...]], result: AnalysisResponse):
+        """Cache a finished analysis unless it failed"""
+        if result.error is None:
+            self.analysis_cache[key] = (time.monotonic(), result)
+            self.analysis_cache.move_to_end(key)
+            if len(self.analysis_cache) > ANALYSIS_CACHE_SIZE:
+                self.analysis_cache.popitem(last=False)
+    
+    async def _analyze_website(self, domain: str, timeout: int, email_priority: Optional[List[str]],
+                               session: Optional[aiohttp.ClientSession]) -> AnalysisResponse:
         """Main website analysis function with parallel optimizations"""
+        # Use the caller's session if given, otherwise borrow the shared one for
+        # connection reuse; it stays open for the whole analysis even if rotated
+        if session is None:
+            async with shared_session.use() as session:
+                return await self._analyze_website(domain, timeout, email_priority, session)
+        
         try:
-            # Use session pool for better connection reuse
-            session = await session_pool.get_session()
-            
             # Fetch website data
             fetch_result = await self.fetch_website(session, domain, timeout)
                 
@@ -1183,8 +1560,9 @@ class WebsiteAnalyzer:
             headers = fetch_result['headers']
             base_url = fetch_result['url']
             
-            # Platform detection
-            platform = self.detect_platform(html)
+            # Platform detection, SEO, contact information and social media
+            page = await self.run_page_analysis(WebsiteAnalyzer.analyze_page, html, base_url, email_priority)
+            platform = page['platform']
             
             # Security analysis
             is_https = 'Yes' if fetch_result['is_https'] else 'No'
@@ -1193,13 +1571,13 @@ class WebsiteAnalyzer:
             has_xframe = 'Yes' if 'x-frame-options' in headers else 'No'
             
             # SEO analysis
-            seo_data = self.analyze_seo(html)
-            seo_score, seo_grade = self.calculate_seo_score(seo_data)
+            seo_data = page['seo_data']
+            seo_score, seo_grade = page['seo_score'], page['seo_grade']
             
             # Contact information - try homepage first
-            emails = self.extract_emails(html, email_priority)
-            phones = self.extract_phones(html)
-            contact_pages = self.extract_contact_pages(html, base_url)
+            emails = page['emails']
+            phones = page['phones']
+            contact_pages = page['contact_pages']
             
             # If no emails found on homepage, try contact pages
             if not emails:
@@ -1208,7 +1586,7 @@ class WebsiteAnalyzer:
                 emails.extend(contact_emails)
             
             # Social media
-            social_links = self.extract_social_links(html)
+            social_links = page['social_links']
             total_social = sum(len(links) for links in social_links.values())
             
             return AnalysisResponse(
@@ -1299,6 +1677,10 @@ class WebsiteAnalyzer:
 # Initialize analyzer
 analyzer = WebsiteAnalyzer()
 
+def run_with_worker_analyzer(method, html: str, *args):
+    """Process pool entry point: call method with this process's own analyzer"""
+    return method(analyzer, html, *args)
+
 def create_error_response(domain: str, error_message: str) -> AnalysisResponse:
     """Create a standardized error response with all required fields"""
     return AnalysisResponse(
@@ -1369,7 +1751,8 @@ async def analyze_websites(request: AnalysisRequest):
     async def analyze_domain_with_semaphore(domain: str) -> AnalysisResponse:
         async with semaphore:
             try:
-                return await analyzer.analyze_website(domain, request.timeout, request.email_priority)
+                return await analyzer.analyze_website(domain, request.timeout, request.email_priority,
+                                                     use_cache=request.use_cache)
             except asyncio.CancelledError:
                 logger.warning(f"Request cancelled for domain: {domain}")
                 return create_error_response(domain, "Request cancelled")
@@ -1420,7 +1803,8 @@ async def analyze_websites_batch(request: AnalysisRequest):
         # Process batch concurrently with error handling
         async def analyze_with_error_handling(domain: str) -> AnalysisResponse:
             try:
-                return await analyzer.analyze_website(domain, request.timeout, request.email_priority)
+                return await analyzer.analyze_website(domain, request.timeout, request.email_priority,
+                                                     use_cache=request.use_cache)
             except asyncio.CancelledError:
                 logger.warning(f"Request cancelled for domain: {domain}")
                 return create_error_response(domain, "Request cancelled")
@@ -1507,7 +1891,8 @@ async def submit_analysis_job(request: AnalysisJobRequest):
         batch_size=request.batch_size,
         timeout=request.timeout,
         priority=request.priority,
-        email_priority=request.email_priority
+        email_priority=request.email_priority,
+        use_cache=request.use_cache
     )
     
     return {"job_id": job_id, "status": "submitted"}
@@ -1520,6 +1905,18 @@ async def get_job_status(job_id: str):
         raise HTTPException(status_code=404, detail="Job not found")
     return job_status
 
+@app.get("/jobs/{job_id}/wait", response_model=JobStatus)
+async def wait_for_job(job_id: str, timeout: float = 30):
+    """Long-poll: return the job status once the job finishes or timeout seconds pass"""
+    if job_id not in worker_queue.jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    # Hold the connection at most 5 minutes
+    job_status = await worker_queue.wait_for_job(job_id, max(0.0, min(timeout, 300.0)))
+    if not job_status:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status
+
 @app.get("/jobs/{job_id}/results")
 async def get_job_results(job_id: str):
     """Get job results by ID"""
@@ -1559,10 +1956,10 @@ async def performance_metrics():
             "delay": rate_limiter.delay,
             "burst_limit": rate_limiter.burst_limit
         },
-        "session_pool": {
-            "pool_size": session_pool.pool_size,
-            "active_sessions": len(session_pool.sessions),
-            "current_index": session_pool.current_index
+        "session": {
+            "active": shared_session.session is not None and not shared_session.session.closed,
+            "connection_limit": shared_session.limit,
+            "limit_per_host": shared_session.limit_per_host
         },
         "worker_queue": queue_stats,
         "recommendations": {
@@ -1577,6 +1974,7 @@ async def performance_metrics():
 @app.on_event("startup")
 async def startup_event():
     """Initialize resources on startup"""
+    shared_session.get_session()
     await worker_queue.start()
     logger.info("Worker queue system started")
 
@@ -1584,7 +1982,8 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup resources on shutdown"""
     await worker_queue.stop()
-    await session_pool.close_all()
+    await shared_session.close()
+    analyzer.shutdown_process_pool()
     logger.info("All resources cleaned up")
 
 if __name__ == "__main__":